@@ -1,19 +1,32 @@
 #!/bin/sh
 # 雨云自动签到启动脚本
-# 支持两种运行模式：Web 常驻与定时模式
+# 支持两种运行模式：Web 常驻与定时模式（定时模式可选 cron / 常驻调度）
 set -e
 
 WEB_ENABLED="${WEB_ENABLED:-true}"
 WEB_HOST="${WEB_HOST:-0.0.0.0}"
 WEB_PORT="${WEB_PORT:-8000}"
+SCHEDULER_MODE="${SCHEDULER_MODE:-cron}"
 
-if [ "$CRON_MODE" = "true" ]; then
+if [ "$CRON_MODE" = "true" ] && [ "$SCHEDULER_MODE" = "daemon" ]; then
+    # 常驻调度：定时任务在进程内触发，不再依赖 cron 冷启动
+    echo "=== 定时模式启用（常驻调度） ==="
+    if [ "$WEB_ENABLED" = "true" ]; then
+        echo "=== Web 面板启动 ==="
+        echo "地址: http://${WEB_HOST}:${WEB_PORT}"
+        exec uvicorn rainyun.web.app:app --host "$WEB_HOST" --port "$WEB_PORT" --no-access-log
+    fi
+    echo "=== Web 面板已关闭，独立运行调度进程 ==="
+    exec /usr/local/bin/python -u -m rainyun.scheduler.daemon
+elif [ "$CRON_MODE" = "true" ]; then
     if [ "$WEB_ENABLED" = "true" ]; then
         echo "=== Web 面板启动 ==="
         echo "地址: http://${WEB_HOST}:${WEB_PORT}"
         uvicorn rainyun.web.app:app --host "$WEB_HOST" --port "$WEB_PORT" --no-access-log &
     else
         echo "=== Web 面板已关闭 ==="
+        # 未开启 captcha_service 设置时该进程会直接退出
+        /usr/local/bin/python -u -m rainyun.captcha.service &
     fi
     echo "=== 定时模式启用 ==="
     /usr/local/bin/python -u -m rainyun.scheduler.cron_sync || echo "警告: cron 同步失败"
@@ -0,0 +1,146 @@
+"""
+每日签到状态预检
+复用浏览器保存的 cookies，通过普通 HTTP 请求判断登录态与今日签到状态，
+确认已签到的账户无需启动浏览器
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+
+from rainyun.browser.cookies import read_cookie_file
+from rainyun.config import Config
+from rainyun.utils.http import build_pooled_session
+
+logger = logging.getLogger(__name__)
+
+PROBE_SIGNED = "signed"
+PROBE_PENDING = "pending"
+PROBE_LOGGED_OUT = "logged_out"
+PROBE_UNKNOWN = "unknown"
+
+# 每日签到任务的“已完成”状态值；只认该字段，不再匹配按钮/提示等自由文本
+_TASK_DONE_STATUS = 2
+_CSRF_COOKIE_NAMES = ("X-CSRF-Token", "csrf_token", "XSRF-TOKEN")
+# 登录失效时 API 返回的 HTTP 状态码
+_LOGGED_OUT_HTTP_STATUS = (401, 403)
+
+
+@dataclass
+class RewardProbeResult:
+    status: str
+    points: Optional[int] = None
+    reason: str = ""
+
+    @property
+    def signed(self) -> bool:
+        return self.status == PROBE_SIGNED
+
+
+def _cookies_expired(cookies: list[dict], now: float) -> bool:
+    """所有带过期时间的 cookie 均已过期，视为登录失效。"""
+    expiries = [cookie.get("expiry") for cookie in cookies if isinstance(cookie.get("expiry"), (int, float))]
+    return bool(expiries) and max(expiries) < now
+
+
+def _build_session(cookies: list[dict], config: Config) -> requests.Session:
+    session = build_pooled_session()
+    csrf_token = ""
+    for cookie in cookies:
+        name = cookie.get("name")
+        value = cookie.get("value", "")
+        session.cookies.set(name, value, domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        if name in _CSRF_COOKIE_NAMES and value:
+            csrf_token = value
+    session.headers.update(
+        {
+            "Origin": config.app_base_url,
+            "Referer": f"{config.app_base_url}/",
+            "Accept": "application/json",
+        }
+    )
+    if csrf_token:
+        session.headers["x-csrf-token"] = csrf_token
+    return session
+
+
+def _task_status(task: dict) -> Optional[int]:
+    status = task.get("Status")
+    # bool 是 int 的子类，需排除
+    if isinstance(status, bool) or not isinstance(status, int):
+        return None
+    return status
+
+
+def _find_daily_sign_task(data, task_id: int) -> Optional[dict]:
+    tasks = data
+    if isinstance(data, dict):
+        tasks = data.get("Records") or data.get("tasks") or data.get("list") or []
+    if not isinstance(tasks, list):
+        return None
+    for task in tasks:
+        if isinstance(task, dict) and task.get("ID") == task_id:
+            return task
+    return None
+
+
+def _get_json(session: requests.Session, url: str, config: Config):
+    """返回 (http_status, payload)，payload 无法解析时为 None。"""
+    response = session.get(url, timeout=config.request_timeout)
+    try:
+        return response.status_code, response.json()
+    except ValueError:
+        return response.status_code, None
+
+
+def probe_daily_reward(config: Config, task_id: int) -> RewardProbeResult:
+    """
+    查询今日签到任务状态
+
+    只有 ID 为 task_id 的任务明确返回 Status == 2 时才返回 signed；任何无法确认的情况
+    （未配置任务 ID、找不到该任务、状态缺失或为其他值）返回 pending/logged_out/unknown，
+    调用方应回退到浏览器流程
+    """
+    user = config.display_name or config.rainyun_user
+    prefix = f"用户 {user} " if user else ""
+    if task_id <= 0:
+        return RewardProbeResult(PROBE_UNKNOWN, reason="task_id_unset")
+    cookies = read_cookie_file(config)
+    if not cookies:
+        return RewardProbeResult(PROBE_LOGGED_OUT, reason="no_cookies")
+    if _cookies_expired(cookies, time.time()):
+        return RewardProbeResult(PROBE_LOGGED_OUT, reason="cookies_expired")
+
+    # 用完不调用 session.close()：会连带关闭共享连接池
+    session = _build_session(cookies, config)
+    try:
+        http_status, payload = _get_json(session, f"{config.api_base_url}/user/reward/tasks", config)
+        if http_status in _LOGGED_OUT_HTTP_STATUS:
+            return RewardProbeResult(PROBE_LOGGED_OUT, reason=f"http_{http_status}")
+        if not isinstance(payload, dict) or payload.get("code") != 200:
+            code = payload.get("code") if isinstance(payload, dict) else http_status
+            return RewardProbeResult(PROBE_UNKNOWN, reason=f"code_{code}")
+        task = _find_daily_sign_task(payload.get("data"), task_id)
+        if task is None:
+            return RewardProbeResult(PROBE_UNKNOWN, reason="task_not_found")
+        status = _task_status(task)
+        if status is None:
+            return RewardProbeResult(PROBE_UNKNOWN, reason="status_missing")
+        if status != _TASK_DONE_STATUS:
+            return RewardProbeResult(PROBE_PENDING, reason=f"status_{status}")
+
+        points = None
+        try:
+            http_status, payload = _get_json(session, f"{config.api_base_url}/user/", config)
+            if isinstance(payload, dict) and payload.get("code") == 200:
+                value = (payload.get("data") or {}).get("Points")
+                if isinstance(value, int):
+                    points = value
+        except requests.RequestException as e:
+            logger.debug(f"{prefix}预检获取积分失败: {e}")
+        return RewardProbeResult(PROBE_SIGNED, points=points)
+    except requests.RequestException as e:
+        logger.warning(f"{prefix}签到状态预检请求失败: {e}")
+        return RewardProbeResult(PROBE_UNKNOWN, reason="request_error")
@@ -30,6 +30,20 @@ def save_cookies(driver: WebDriver, config: Config) -> None:
     logger.info(f"{prefix}Cookies 已保存到 {config.cookie_file}")
 
 
+def read_cookie_file(config: Config) -> list[dict] | None:
+    """只读加载 cookies 文件，不存在或无法解析时返回 None（不做备份/清空）。"""
+    if not os.path.exists(config.cookie_file):
+        return None
+    try:
+        with open(config.cookie_file, "r") as f:
+            cookies = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(cookies, list):
+        return None
+    return [cookie for cookie in cookies if isinstance(cookie, dict) and cookie.get("name")]
+
+
 def load_cookies(driver: WebDriver, config: Config) -> bool:
     """从文件加载 cookies。"""
     prefix = _user_prefix(config)
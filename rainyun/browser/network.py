@@ -0,0 +1,95 @@
+"""基于 CDP 的网络响应捕获：直接从浏览器已下载的响应中取出验证码图片，无需再次下载。
+
+chromedriver 的 performance 日志会记录 Network.responseReceived 事件（含 requestId），
+再通过 Network.getResponseBody 读取响应体。验证码位于跨站 iframe 中，开启捕获时浏览器需
+关闭站点隔离（见 BrowserSession），让 iframe 与页面同进程，其请求才会出现在页面的网络事件里。
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 只保留最近的图片响应，避免长时间运行后映射无限增长
+_MAX_TRACKED_RESPONSES = 64
+# 开启捕获时追加的 Chrome 参数：关闭站点隔离，跨站 iframe 不再运行在独立进程
+CAPTURE_CHROME_ARGUMENTS = ("--disable-features=IsolateOrigins,site-per-process",)
+
+
+def enable_performance_log(options: Any) -> None:
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    for argument in CAPTURE_CHROME_ARGUMENTS:
+        options.add_argument(argument)
+
+
+class NetworkCapture:
+    """按 URL 索引浏览器已收到的图片响应。"""
+
+    def __init__(self, driver: Any) -> None:
+        self._driver = driver
+        self._responses: OrderedDict[str, str] = OrderedDict()
+        self.enabled = False
+
+    def enable(self) -> bool:
+        try:
+            self._driver.execute_cdp_cmd("Network.enable", {})
+            self.enabled = True
+        except Exception as exc:
+            logger.warning("启用网络捕获失败，将回退为截图/重新下载: %s", exc)
+            self.enabled = False
+        return self.enabled
+
+    def _drain(self) -> None:
+        try:
+            entries = self._driver.get_log("performance")
+        except Exception as exc:
+            logger.debug("读取 performance 日志失败: %s", exc)
+            return
+        for entry in entries:
+            raw = entry.get("message", "")
+            # 先做字符串过滤，只解析图片响应事件
+            if "Network.responseReceived" not in raw or '"Image"' not in raw:
+                continue
+            try:
+                message = json.loads(raw)["message"]
+                params = message["params"]
+                url = params["response"]["url"]
+                request_id = params["requestId"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get("method") != "Network.responseReceived":
+                continue
+            self._responses[url] = request_id
+            self._responses.move_to_end(url)
+            while len(self._responses) > _MAX_TRACKED_RESPONSES:
+                self._responses.popitem(last=False)
+
+    def response_body(self, url: str) -> bytes | None:
+        """返回浏览器收到的响应体；未捕获到或已被浏览器回收时返回 None。"""
+        if not self.enabled or not url:
+            return None
+        self._drain()
+        request_id = self._responses.get(url)
+        if request_id is None:
+            return None
+        try:
+            result = self._driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception as exc:
+            logger.debug("读取响应体失败 %s: %s", url, exc)
+            return None
+        body = result.get("body") or ""
+        if result.get("base64Encoded"):
+            return base64.b64decode(body)
+        return body.encode("latin-1") if body else None
+
+
+def attach_network_capture(driver: Any, config: Any) -> NetworkCapture | None:
+    if not getattr(config, "captcha_network_capture", False):
+        return None
+    capture = NetworkCapture(driver)
+    return capture if capture.enable() else None
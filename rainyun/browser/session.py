@@ -13,6 +13,7 @@ from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.support.wait import WebDriverWait
 
 from rainyun.api.client import RainyunAPI
+from rainyun.browser.network import NetworkCapture, enable_performance_log
 from rainyun.config import Config
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class RuntimeContext:
     temp_dir: str
     api: RainyunAPI
     config: Config
+    network: NetworkCapture | None = None
 
 
 class BrowserSession:
@@ -48,6 +50,12 @@ class BrowserSession:
         self.temp_dir = temp_dir
         return driver, wait, temp_dir
 
+    def service_pid(self) -> int | None:
+        """chromedriver 进程号（浏览器为其子进程），用于统计会话内存。"""
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        return getattr(process, "pid", None)
+
     def close(self) -> None:
         if not self.driver:
             return
@@ -61,6 +69,8 @@ class BrowserSession:
         ops.add_argument("--no-sandbox")
         if self.debug:
             ops.add_experimental_option("detach", True)
+        if self.config.captcha_network_capture:
+            enable_performance_log(ops)
         if self.linux:
             ops.add_argument("--headless")
             ops.add_argument("--disable-gpu")
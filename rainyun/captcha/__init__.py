@@ -0,0 +1,5 @@
+"""验证码识别相关模块。"""
+
+from .assignment import Assignment, best_per_sprite, rank_assignments
+
+__all__ = ["Assignment", "best_per_sprite", "rank_assignments"]
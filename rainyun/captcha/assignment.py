@@ -0,0 +1,95 @@
+"""小图 → 候选框的最优分配（基于相似度矩阵的向量化求解）。
+
+排序语义与原 combinations × permutations 穷举一致：按 (最低分, 平均分, 总分) 取最大，
+平均分与总分单调等价，因此等同于按 (最低分, 总分) 排序；分数完全相同时保持原穷举顺序
+（先按选中框的升序组合，再按排列）。
+
+剪枝依据：若某分配中小图 i 使用的框不在其前 (m - 1 + k) 名内，则这些前列框中至少有 k 个
+未被其他小图占用，逐一替换都能得到不差的分配，因此它不可能进入前 k 名。于是每个小图
+只需考虑自身前 (m - 1 + k) 个候选框，枚举规模与框数量无关。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Assignment:
+    boxes: tuple[int, ...]
+    scores: tuple[float, ...]
+
+    @property
+    def min_score(self) -> float:
+        return min(self.scores)
+
+    @property
+    def sum_score(self) -> float:
+        return float(sum(self.scores))
+
+
+@lru_cache(maxsize=64)
+def _product_indices(sizes: tuple[int, ...]) -> np.ndarray:
+    """各候选列表下标的笛卡尔积，形状 (prod(sizes), len(sizes))。"""
+
+    grids = np.meshgrid(*[np.arange(size) for size in sizes], indexing="ij")
+    return np.stack([grid.reshape(-1) for grid in grids], axis=1)
+
+
+def _distinct_rows(tuples: np.ndarray) -> np.ndarray:
+    mask = np.ones(len(tuples), dtype=bool)
+    columns = tuples.shape[1]
+    for left in range(columns):
+        for right in range(left + 1, columns):
+            mask &= tuples[:, left] != tuples[:, right]
+    return tuples[mask]
+
+
+def rank_assignments(similarity: np.ndarray, top_k: int = 1) -> list[Assignment]:
+    """返回按 (最低分, 总分) 降序的前 top_k 个一一分配。
+
+    similarity 形状为 (小图数, 候选框数)，要求候选框数 ≥ 小图数。
+    """
+
+    matrix = np.nan_to_num(np.asarray(similarity, dtype=np.float64), nan=0.0)
+    sprite_count, box_count = matrix.shape
+    if sprite_count == 0 or box_count < sprite_count or top_k <= 0:
+        return []
+    keep = min(box_count, sprite_count - 1 + top_k)
+    # 每个小图的前 keep 个候选框（稳定排序：同分按框下标）
+    candidates = np.argsort(-matrix, axis=1, kind="stable")[:, :keep]
+    picks = _product_indices((keep,) * sprite_count)
+    tuples = candidates[np.arange(sprite_count), picks]
+    tuples = _distinct_rows(tuples)
+    if len(tuples) == 0:
+        return []
+
+    scores = matrix[np.arange(sprite_count), tuples]
+    min_scores = scores.min(axis=1)
+    sum_scores = scores[:, 0].copy()
+    for column in range(1, sprite_count):
+        sum_scores += scores[:, column]
+    # np.lexsort 以最后一个键为主键：依次为 最低分、总分、组合序、排列序
+    ordered_boxes = np.sort(tuples, axis=1)
+    keys = [tuples[:, column] for column in reversed(range(sprite_count))]
+    keys += [ordered_boxes[:, column] for column in reversed(range(sprite_count))]
+    keys += [-sum_scores, -min_scores]
+    order = np.lexsort(keys)[:top_k]
+    return [
+        Assignment(
+            boxes=tuple(int(box) for box in tuples[row]),
+            scores=tuple(float(value) for value in scores[row]),
+        )
+        for row in order
+    ]
+
+
+def best_per_sprite(similarity: np.ndarray) -> list[int]:
+    """候选框少于小图时的降级：每个小图独立取最高分框（允许重复）。"""
+
+    matrix = np.nan_to_num(np.asarray(similarity, dtype=np.float64), nan=0.0)
+    return [int(index) for index in np.argmax(matrix, axis=1)]
+
@@ -0,0 +1,193 @@
+"""进程内推理批处理：收集多个账户并发提交的检测/识别请求，按小时间窗口成批执行。
+
+ddddocr 自带的 ONNX 模型输入形状固定为 batch=1（det: [1, 3, 416, 416]，ocr: [1, 1, 64, W]），
+无法把多张图拼成一个张量推理。因此这里的“批”是一次调度：窗口内的请求按内容去重后在同一
+模型会话上依次执行，相同图片（多个账户同时遇到同一张验证码、重试时重复提交）只推理一次。
+每种模型一个调度线程，记录排队等待、批大小、去重命中与吞吐。
+
+通过 CAPTCHA_BATCH_WINDOW_MS 开启（毫秒，默认 0 为关闭，直接走模型池）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Any
+
+import numpy as np
+
+from rainyun.captcha.metrics import LatencyStats
+from rainyun.captcha.models import MODEL_DET, MODEL_KINDS, MODEL_OCR, ModelRegistry, get_model_registry
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_BATCH = 8
+
+
+def batch_window_from_env() -> float:
+    try:
+        return max(0.0, float(os.environ.get("CAPTCHA_BATCH_WINDOW_MS", "0"))) / 1000
+    except ValueError:
+        return 0.0
+
+
+def _digest(image: Any) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    if isinstance(image, np.ndarray):
+        hasher.update(str(image.shape).encode())
+        hasher.update(np.ascontiguousarray(image).tobytes())
+    elif isinstance(image, (bytes, bytearray)):
+        hasher.update(image)
+    else:
+        # PIL 图片等其他类型不去重
+        hasher.update(str(id(image)).encode())
+    return hasher.hexdigest()
+
+
+@dataclass
+class _Request:
+    image: Any
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class _BatchStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.queue_wait = LatencyStats()
+        self.batches = 0
+        self.requests = 0
+        self.inferences = 0
+        self.max_batch = 0
+        self.started_at = time.time()
+
+    def record_batch(self, size: int, inferences: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self.inferences += inferences
+            self.max_batch = max(self.max_batch, size)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            elapsed = max(time.time() - self.started_at, 1e-9)
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "inferences": self.inferences,
+                "dedup_hits": self.requests - self.inferences,
+                "avg_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "max_batch": self.max_batch,
+                "requests_per_min": round(self.requests * 60 / elapsed, 2),
+                "queue_wait": self.queue_wait.snapshot(),
+            }
+
+
+class InferenceBatcher:
+    """每种模型一个调度线程；调用方阻塞等待自己的结果。"""
+
+    def __init__(
+        self,
+        registry: ModelRegistry | None = None,
+        window: float = 0.005,
+        max_batch: int = _DEFAULT_MAX_BATCH,
+    ) -> None:
+        self._registry = registry or get_model_registry()
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._queues: dict[str, Queue] = {kind: Queue() for kind in MODEL_KINDS}
+        self._stats = {kind: _BatchStats() for kind in MODEL_KINDS}
+        self._threads: dict[str, Thread] = {}
+        self._lock = Lock()
+
+    def _ensure_thread(self, kind: str) -> None:
+        with self._lock:
+            thread = self._threads.get(kind)
+            if thread is not None and thread.is_alive():
+                return
+            thread = Thread(target=self._loop, args=(kind,), name=f"rainyun-batch-{kind}", daemon=True)
+            self._threads[kind] = thread
+            thread.start()
+
+    def _collect(self, queue: Queue) -> list[_Request]:
+        batch = [queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _infer(self, kind: str, image: Any):
+        if kind == MODEL_DET:
+            return self._registry.detection(image)
+        return self._registry.classification(image)
+
+    def _loop(self, kind: str) -> None:
+        queue = self._queues[kind]
+        stats = self._stats[kind]
+        while True:
+            batch = self._collect(queue)
+            started = time.perf_counter()
+            groups: dict[str, list[_Request]] = {}
+            for request in batch:
+                stats.queue_wait.record(started - request.enqueued_at)
+                groups.setdefault(_digest(request.image), []).append(request)
+            for requests in groups.values():
+                try:
+                    result = self._infer(kind, requests[0].image)
+                except Exception as exc:
+                    for request in requests:
+                        request.future.set_exception(exc)
+                    continue
+                for request in requests:
+                    request.future.set_result(result)
+            stats.record_batch(len(batch), len(groups))
+
+    def submit(self, kind: str, image: Any) -> Future:
+        if kind not in self._queues:
+            raise ValueError(f"未知模型类型: {kind}")
+        self._ensure_thread(kind)
+        future: Future = Future()
+        self._queues[kind].put(_Request(image, future))
+        return future
+
+    def classification(self, image: Any):
+        return self.submit(MODEL_OCR, image).result()
+
+    def detection(self, image: Any):
+        return self.submit(MODEL_DET, image).result()
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "window_ms": round(self.window * 1000, 2),
+            "max_batch": self.max_batch,
+            **{kind: stats.snapshot() for kind, stats in self._stats.items()},
+        }
+
+
+_batcher: InferenceBatcher | None = None
+_batcher_lock = Lock()
+
+
+def get_inference_batcher() -> InferenceBatcher | None:
+    """CAPTCHA_BATCH_WINDOW_MS > 0 时返回进程内共享的批处理器，否则返回 None。"""
+    global _batcher
+    window = batch_window_from_env()
+    if window <= 0:
+        return None
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = InferenceBatcher(window=window)
+            logger.info("已启用验证码推理批处理，窗口 %.1f ms", window * 1000)
+        return _batcher
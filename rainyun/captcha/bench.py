@@ -0,0 +1,304 @@
+"""离线验证码基准：回放 save_captcha_samples 保存的样本，评估各阶段耗时与识别效果。
+
+用法：python -m rainyun.captcha.bench [样本目录] [--tolerance 像素] [--limit 数量] [--compare 实现]
+
+对每个样本依次执行 detect_captcha_bboxes → 各匹配器/求解器 → check_answer，输出：
+- 每个阶段的耗时分位数（检测只统计一次，各匹配器共用检测框）；
+- 作答率：得到结果且通过 check_answer 的比例；
+- 准确率：仅统计带 label.json 的样本，格式 {"positions": [[x, y], [x, y], [x, y]]}，
+  按小图顺序给出背景图上的点击坐标，每个预测点与标注点的距离不超过容差即视为正确；
+- 次优命中：首选答案错误、但某个次优候选分配正确的样本数（线上会在同一张图上改交）。
+
+--compare 对比优化后的实现与原逐对实现（唯一保留的参考实现在本模块中）的耗时与结果一致性。
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from rainyun.captcha.corpus import CaptchaSample, iter_samples
+from rainyun.captcha.metrics import LatencyStats
+from rainyun.utils.image import normalize_gray
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_ROOT = "temp/captcha_samples"
+_DEFAULT_TOLERANCE = 15
+
+
+@dataclass
+class StageReport:
+    name: str
+    latency: LatencyStats = field(default_factory=LatencyStats)
+    answered: int = 0
+    labelled: int = 0
+    correct: int = 0
+    rescued: int = 0
+
+
+@dataclass
+class BenchmarkReport:
+    sample_root: str
+    total: int = 0
+    stages: list[StageReport] = field(default_factory=list)
+
+
+def _label_positions(sample: CaptchaSample) -> list[tuple[int, int]] | None:
+    positions = (sample.label or {}).get("positions")
+    if not isinstance(positions, list):
+        return None
+    try:
+        return [(int(x), int(y)) for x, y in positions]
+    except (TypeError, ValueError):
+        return None
+
+
+def is_correct(predicted, expected, tolerance: int) -> bool:
+    if not predicted or len(predicted) != len(expected):
+        return False
+    return all(
+        (px - ex) ** 2 + (py - ey) ** 2 <= tolerance ** 2 for (px, py), (ex, ey) in zip(predicted, expected)
+    )
+
+
+def _build_solvers():
+    from rainyun.config import get_default_config
+    from rainyun.main import FusedCaptchaSolver, SiftMatcher, TemplateMatcher
+
+    config = get_default_config()
+    sift = SiftMatcher()
+    template = TemplateMatcher()
+    fused = FusedCaptchaSolver(
+        [(sift, config.captcha_sift_weight), (template, config.captcha_template_weight)]
+    )
+    return [(sift.name, sift.match), (template.name, template.match), (fused.name, fused.solve)]
+
+
+def run_benchmark(
+    sample_root: str = DEFAULT_SAMPLE_ROOT, tolerance: int = _DEFAULT_TOLERANCE, limit: int = 0
+) -> BenchmarkReport:
+    from rainyun.main import LazyDdddOcr, check_answer, detect_captcha_bboxes
+
+    ctx = SimpleNamespace(det=LazyDdddOcr(det=True))
+    solvers = _build_solvers()
+    detect = StageReport("detect")
+    reports = {name: StageReport(name) for name, _ in solvers}
+    checking = StageReport("check_answer")
+    total = 0
+    for sample in iter_samples(sample_root):
+        if limit and total >= limit:
+            break
+        total += 1
+        expected = _label_positions(sample)
+        with detect.latency.timed():
+            bboxes = detect_captcha_bboxes(ctx, sample.background_bytes, sample.background)
+        if bboxes:
+            detect.answered += 1
+        for name, solve in solvers:
+            report = reports[name]
+            with report.latency.timed():
+                result = solve(sample.background, sample.sprites, bboxes) if bboxes else None
+            if result is None:
+                continue
+            with checking.latency.timed():
+                accepted = check_answer(result)
+            if accepted:
+                report.answered += 1
+            if expected is not None:
+                report.labelled += 1
+                primary_correct = is_correct(result.positions, expected, tolerance)
+                if accepted and primary_correct:
+                    report.correct += 1
+                elif not primary_correct and any(
+                    is_correct(item.positions, expected, tolerance) for item in result.alternatives
+                ):
+                    report.rescued += 1
+    return BenchmarkReport(sample_root, total, [detect, *reports.values(), checking])
+
+
+def print_report(report: BenchmarkReport) -> None:
+    if not report.total:
+        print(f"{report.sample_root} 下没有可用样本")
+        return
+    print(f"样本 {report.total} 个（{report.sample_root}）")
+    print(
+        f"{'阶段':<14}{'次数':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}"
+        f"{'作答率':>8}{'准确率':>10}{'次优命中':>8}"
+    )
+    for stage in report.stages:
+        stats = stage.latency.snapshot()
+        answer_rate = "-" if stage.name == "check_answer" else f"{stage.answered / report.total:.0%}"
+        accuracy = f"{stage.correct}/{stage.labelled}" if stage.labelled else "-"
+        rescued = str(stage.rescued) if stage.labelled else "-"
+        print(
+            f"{stage.name:<14}{stats['count']:>6}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['max_ms']:>10.1f}{answer_rate:>8}{accuracy:>10}{rescued:>8}"
+        )
+
+
+def _legacy_sift_pair(sprite: np.ndarray, spec: np.ndarray, sift) -> float:
+    """原逐对 SIFT 实现（每对都重新提取特征并新建匹配器），仅供对比。"""
+
+    kp1, des1 = sift.detectAndCompute(normalize_gray(sprite), None)
+    kp2, des2 = sift.detectAndCompute(normalize_gray(spec), None)
+    if des1 is None or des2 is None:
+        return 0.0
+    matches = cv2.BFMatcher().knnMatch(des1, des2, k=2)
+    good = [m for m_n in matches if len(m_n) == 2 for m, n in [m_n] if m.distance < 0.8 * n.distance]
+    if not matches or len(good) == 0:
+        return 0.0
+    return len(good) / len(matches)
+
+
+def compare_sift(sample_root: str) -> None:
+    from rainyun.captcha.sift import DescriptorMatcher, SiftFeatureExtractor, sift_similarity_matrix
+
+    sift = cv2.SIFT_create()
+    legacy_total = fast_total = 0.0
+    count = 0
+    mismatched = 0
+    for sample in iter_samples(sample_root, with_boxes=True):
+        specs = sample.crops()
+        if not specs:
+            continue
+        start = time.perf_counter()
+        legacy = np.array([[_legacy_sift_pair(sprite, spec, sift) for spec in specs] for sprite in sample.sprites])
+        legacy_total += time.perf_counter() - start
+        start = time.perf_counter()
+        fast = sift_similarity_matrix(sample.sprites, specs, SiftFeatureExtractor(sift), DescriptorMatcher())
+        fast_total += time.perf_counter() - start
+        mismatched += int(not np.allclose(legacy, fast))
+        count += 1
+    if not count:
+        logger.warning("%s 下没有可用样本", sample_root)
+        return
+    logger.info(
+        "SIFT 样本 %s 个：逐对 %.1f ms/次，缓存 %.1f ms/次，加速 %.1fx，结果不一致 %s 个",
+        count,
+        legacy_total * 1000 / count,
+        fast_total * 1000 / count,
+        legacy_total / max(fast_total, 1e-9),
+        mismatched,
+    )
+
+
+def _legacy_template_pair(sprite: np.ndarray, spec: np.ndarray) -> float:
+    """原逐对模板匹配实现（小图缩放到候选框尺寸后 matchTemplate），仅供对比。"""
+
+    sprite_gray = normalize_gray(sprite)
+    spec_gray = normalize_gray(spec)
+    if sprite_gray is None or spec_gray is None or sprite_gray.size == 0 or spec_gray.size == 0:
+        return 0.0
+    if sprite_gray.shape != spec_gray.shape:
+        sprite_gray = cv2.resize(sprite_gray, (spec_gray.shape[1], spec_gray.shape[0]))
+    return float(np.max(cv2.matchTemplate(spec_gray, sprite_gray, cv2.TM_CCOEFF_NORMED)))
+
+
+def compare_template(sample_root: str) -> None:
+    from rainyun.captcha.assignment import rank_assignments
+    from rainyun.captcha.template import template_similarity_matrix
+
+    legacy_total = batched_total = 0.0
+    count = 0
+    same_answer = 0
+    max_delta = 0.0
+    for sample in iter_samples(sample_root, with_boxes=True):
+        specs = sample.crops()
+        if len(specs) < len(sample.sprites):
+            continue
+        start = time.perf_counter()
+        legacy = np.array([[_legacy_template_pair(sprite, spec) for spec in specs] for sprite in sample.sprites])
+        legacy_total += time.perf_counter() - start
+        start = time.perf_counter()
+        batched = template_similarity_matrix(sample.sprites, specs)
+        batched_total += time.perf_counter() - start
+        max_delta = max(max_delta, float(np.abs(legacy - batched).max()))
+        same_answer += int(rank_assignments(legacy)[0].boxes == rank_assignments(batched)[0].boxes)
+        count += 1
+    if not count:
+        logger.warning("%s 下没有可用样本", sample_root)
+        return
+    logger.info(
+        "模板匹配样本 %s 个：逐对 %.2f ms/次，批量 %.2f ms/次，加速 %.1fx，分配一致 %s/%s，最大分差 %.3f",
+        count,
+        legacy_total * 1000 / count,
+        batched_total * 1000 / count,
+        legacy_total / max(batched_total, 1e-9),
+        same_answer,
+        count,
+        max_delta,
+    )
+
+
+def _legacy_rank(matrix: list[list[float]]) -> tuple[int, ...] | None:
+    """原 combinations × permutations 穷举分配，仅供对比。"""
+
+    from itertools import combinations, permutations
+
+    best = None
+    best_key = None
+    sprite_count = len(matrix)
+    for chosen in combinations(range(len(matrix[0])), sprite_count):
+        for perm in permutations(chosen):
+            scores = [matrix[i][perm[i]] for i in range(sprite_count)]
+            key = (min(scores), sum(scores) / len(scores), sum(scores))
+            if best_key is None or key > best_key:
+                best_key = key
+                best = perm
+    return best
+
+
+def compare_assignment(_sample_root: str) -> None:
+    """随机相似度矩阵上对比穷举与向量化分配（不依赖样本）。"""
+
+    from rainyun.captcha.assignment import rank_assignments
+
+    rng = np.random.default_rng(0)
+    rounds = 20
+    for box_count in (3, 5, 8, 10, 15, 20, 30, 50):
+        matrices = [np.round(rng.random((3, box_count)), 3) for _ in range(rounds)]
+        start = time.perf_counter()
+        legacy = [_legacy_rank(matrix.tolist()) for matrix in matrices]
+        legacy_ms = (time.perf_counter() - start) * 1000 / rounds
+        start = time.perf_counter()
+        fast = [rank_assignments(matrix)[0] for matrix in matrices]
+        fast_ms = (time.perf_counter() - start) * 1000 / rounds
+        same = all(item.boxes == tuple(ref) for item, ref in zip(fast, legacy))
+        logger.info(
+            "分配求解 %s 个候选框：穷举 %.3f ms，向量化 %.3f ms，结果%s",
+            box_count,
+            legacy_ms,
+            fast_ms,
+            "一致" if same else "不一致",
+        )
+
+
+_COMPARISONS = {"assignment": compare_assignment, "sift": compare_sift, "template": compare_template}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="回放已保存的验证码样本，评估识别耗时与成功率")
+    parser.add_argument("sample_root", nargs="?", default=DEFAULT_SAMPLE_ROOT)
+    parser.add_argument("--tolerance", type=int, default=_DEFAULT_TOLERANCE, help="标注坐标容差（像素）")
+    parser.add_argument("--limit", type=int, default=0, help="最多回放的样本数，0 为不限")
+    parser.add_argument("--compare", choices=sorted(_COMPARISONS), help="对比优化实现与原逐对实现")
+    args = parser.parse_args(argv)
+    import rainyun.main  # noqa: F401  导入时会重设日志级别，需先导入再调整
+
+    # 识别流程的逐样本日志在基准中只会刷屏
+    logging.getLogger("rainyun.main").setLevel(logging.ERROR)
+    if args.compare:
+        _COMPARISONS[args.compare](args.sample_root)
+        return
+    print_report(run_benchmark(args.sample_root, args.tolerance, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""验证码答案缓存：按背景图与小图的感知哈希（dHash）索引已求解的坐标与提交结果。
+
+同一张验证码图片会在多次尝试、多个账户间重复出现。命中提交成功的记录时直接复用坐标，
+跳过检测与匹配；提交失败的坐标记为已知错误，之后不再重复提交。
+内存层为 LRU，磁盘层为 data/ 下的 JSON 文件（仅在提交结果变化时写入）。写入时在文件锁内
+重新读取磁盘内容并合并，避免多个进程或共享 data 卷的节点互相覆盖记录。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Iterator
+from uuid import uuid4
+
+import cv2
+import numpy as np
+
+from rainyun.data.models import DEFAULT_DATA_PATH
+from rainyun.utils.image import normalize_gray
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CAPACITY = 512
+# 每张图最多记录的错误答案数量
+_MAX_REJECTED = 8
+# 近似命中的汉明距离上限（背景 256 位 / 小图 64 位），容忍重新压缩带来的少量位翻转
+_MAX_BACKGROUND_DISTANCE = 16
+_MAX_SPRITE_DISTANCE = 4
+
+Positions = list[tuple[int, int]]
+
+
+def dhash(image: np.ndarray, size: int = 8) -> int:
+    """差值哈希：缩放到 (size+1)×size 灰度图，逐行比较相邻像素，对 JPEG 重新编码不敏感。"""
+    gray = normalize_gray(image)
+    resized = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (resized[:, 1:] > resized[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def captcha_key(background: np.ndarray, sprite_image: np.ndarray) -> str:
+    # 背景图尺寸较大，使用 16×16 哈希降低不同图片碰撞的概率
+    return f"{dhash(background, 16):064x}-{dhash(sprite_image):016x}"
+
+
+def _split_key(key: str) -> tuple[int, int] | None:
+    try:
+        background, sprite = key.split("-", 1)
+        return int(background, 16), int(sprite, 16)
+    except ValueError:
+        return None
+
+
+def _is_near(left: tuple[int, int], right: tuple[int, int]) -> bool:
+    return (
+        bin(left[0] ^ right[0]).count("1") <= _MAX_BACKGROUND_DISTANCE
+        and bin(left[1] ^ right[1]).count("1") <= _MAX_SPRITE_DISTANCE
+    )
+
+
+@dataclass
+class CaptchaAssets:
+    """一次验证码尝试下载并解码后的图片。"""
+
+    background_bytes: bytes
+    background: np.ndarray
+    sprite_image: np.ndarray
+    sprites: list[np.ndarray]
+    key: str = ""
+    # 小图原始字节（转发给识别服务时避免重新编码）；缺失时按需从 sprite_image 编码
+    sprite_bytes: bytes = b""
+
+    def __post_init__(self) -> None:
+        if not self.key:
+            self.key = captcha_key(self.background, self.sprite_image)
+
+
+@dataclass
+class CachedSolution:
+    positions: Positions | None = None
+    rejected: list[Positions] = field(default_factory=list)
+    updated_at: float = 0.0
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "CachedSolution":
+        def read_positions(value) -> Positions | None:
+            if not isinstance(value, list):
+                return None
+            try:
+                return [(int(x), int(y)) for x, y in value]
+            except (TypeError, ValueError):
+                return None
+
+        rejected = [read_positions(item) for item in payload.get("rejected") or []]
+        return cls(
+            positions=read_positions(payload.get("positions")),
+            rejected=[item for item in rejected if item],
+            updated_at=float(payload.get("updated_at") or 0.0),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "positions": [list(point) for point in self.positions] if self.positions else None,
+            "rejected": [[list(point) for point in item] for item in self.rejected],
+            "updated_at": self.updated_at,
+        }
+
+    def merged(self, other: "CachedSolution") -> "CachedSolution":
+        """合并两份记录：错误答案取并集，成功坐标取较新的一份且不得是已知错误答案。"""
+        newer, older = (self, other) if self.updated_at >= other.updated_at else (other, self)
+        rejected = list(newer.rejected)
+        for item in older.rejected:
+            if item not in rejected:
+                rejected.insert(0, item)
+        positions = newer.positions or older.positions
+        if positions in rejected:
+            positions = None
+        return CachedSolution(
+            positions=positions,
+            rejected=rejected[-_MAX_REJECTED:],
+            updated_at=newer.updated_at,
+        )
+
+
+def _default_cache_path() -> Path:
+    data_path = Path(os.environ.get("DATA_PATH", DEFAULT_DATA_PATH))
+    return data_path.parent / "captcha_cache.json"
+
+
+class SolutionCache:
+    def __init__(self, path: str | Path | None = None, capacity: int = _DEFAULT_CAPACITY) -> None:
+        self.path = Path(path) if path else _default_cache_path()
+        self.capacity = capacity
+        self._entries: OrderedDict[str, CachedSolution] = OrderedDict()
+        self._lock = Lock()
+        self._loaded = False
+
+    def _read_entries(self) -> dict[str, CachedSolution]:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("验证码缓存读取失败，将重新建立: %s", exc)
+            return {}
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            key: CachedSolution.from_dict(value) for key, value in entries.items() if isinstance(value, dict)
+        }
+
+    def _replace_entries(self, entries: dict[str, CachedSolution]) -> None:
+        """按更新时间重建 LRU，只保留最近的 capacity 条。"""
+        items = sorted(entries.items(), key=lambda item: item[1].updated_at)
+        self._entries = OrderedDict(items[-self.capacity:])
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        self._replace_entries(self._read_entries())
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        try:
+            import fcntl
+        except Exception:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _save(self) -> None:
+        """在文件锁内与磁盘上的最新内容合并后再写入，保留其他进程记录的答案与错误答案。"""
+        try:
+            with self._file_lock():
+                entries = self._read_entries()
+                for key, entry in self._entries.items():
+                    existing = entries.get(key)
+                    entries[key] = entry.merged(existing) if existing else entry
+                self._replace_entries(entries)
+                payload = {"entries": {key: entry.to_dict() for key, entry in self._entries.items()}}
+                tmp_path = self.path.with_name(f"{self.path.name}.{uuid4().hex[:8]}.tmp")
+                tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+                tmp_path.replace(self.path)
+        except OSError as exc:
+            logger.warning("验证码缓存写入失败: %s", exc)
+
+    def _resolve(self, key: str) -> str | None:
+        """精确命中优先，否则在缓存中查找哈希足够接近的同一张图。"""
+        if key in self._entries:
+            return key
+        target = _split_key(key)
+        if target is None:
+            return None
+        for candidate in reversed(self._entries):
+            hashes = _split_key(candidate)
+            if hashes is not None and _is_near(target, hashes):
+                return candidate
+        return None
+
+    def _touch(self, key: str) -> CachedSolution:
+        key = self._resolve(key) or key
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = CachedSolution()
+            self._entries[key] = entry
+        self._entries.move_to_end(key)
+        entry.updated_at = time.time()
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return entry
+
+    def lookup(self, key: str) -> Positions | None:
+        """返回已提交成功的坐标。"""
+        with self._lock:
+            self._ensure_loaded()
+            resolved = self._resolve(key)
+            if resolved is None:
+                return None
+            entry = self._entries[resolved]
+            self._entries.move_to_end(resolved)
+            return list(entry.positions) if entry.positions else None
+
+    def is_rejected(self, key: str, positions: Positions) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            resolved = self._resolve(key)
+            return bool(resolved and list(positions) in self._entries[resolved].rejected)
+
+    def record_success(self, key: str, positions: Positions) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._touch(key)
+            entry.positions = list(positions)
+            self._save()
+
+    def record_failure(self, key: str, positions: Positions) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._touch(key)
+            positions = list(positions)
+            if entry.positions == positions:
+                entry.positions = None
+            if positions not in entry.rejected:
+                entry.rejected = (entry.rejected + [positions])[-_MAX_REJECTED:]
+            self._save()
+
+
+_cache: SolutionCache | None = None
+_cache_lock = Lock()
+
+
+def get_solution_cache() -> SolutionCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SolutionCache()
+        return _cache
@@ -0,0 +1,95 @@
+"""验证码样本集读取（save_captcha_samples 保存的目录结构），供基准与离线评估使用。
+
+每个样本目录包含 background.jpg、sprite_1..3.jpg、reason.txt；
+可选 bboxes.json（检测框缓存）与 label.json（人工标注答案）。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import cv2
+import numpy as np
+
+from rainyun.utils.image import crop_boxes
+
+
+@dataclass
+class CaptchaSample:
+    path: str
+    background: np.ndarray
+    background_bytes: bytes
+    sprites: list[np.ndarray]
+    reason: str = ""
+    bboxes: list[tuple[int, int, int, int]] = field(default_factory=list)
+    label: dict | None = None
+
+    def crops(self) -> list[np.ndarray]:
+        return [crop for _, crop in crop_boxes(self.background, self.bboxes)]
+
+
+def _read_json(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_reason(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("reason:"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return ""
+
+
+def load_sample(path: str) -> CaptchaSample | None:
+    background_path = os.path.join(path, "background.jpg")
+    if not os.path.isfile(background_path):
+        return None
+    with open(background_path, "rb") as handle:
+        background_bytes = handle.read()
+    background = cv2.imdecode(np.frombuffer(background_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if background is None:
+        return None
+    sprites = []
+    for index in range(1, 4):
+        sprite = cv2.imread(os.path.join(path, f"sprite_{index}.jpg"), cv2.IMREAD_COLOR)
+        if sprite is None:
+            return None
+        sprites.append(sprite)
+    boxes = _read_json(os.path.join(path, "bboxes.json"))
+    return CaptchaSample(
+        path=path,
+        background=background,
+        background_bytes=background_bytes,
+        sprites=sprites,
+        reason=_read_reason(os.path.join(path, "reason.txt")),
+        bboxes=[tuple(box) for box in boxes] if isinstance(boxes, list) else [],
+        label=_read_json(os.path.join(path, "label.json")),
+    )
+
+
+def iter_samples(root: str, *, with_boxes: bool = False, det=None) -> Iterator[CaptchaSample]:
+    """遍历样本目录；with_boxes=True 时对缺少 bboxes.json 的样本运行一次检测。"""
+
+    if not os.path.isdir(root):
+        return
+    for name in sorted(os.listdir(root)):
+        sample = load_sample(os.path.join(root, name))
+        if sample is None:
+            continue
+        if with_boxes and not sample.bboxes:
+            if det is None:
+                import ddddocr
+
+                det = ddddocr.DdddOcr(det=True, show_ad=False)
+            sample.bboxes = [tuple(box) for box in det.detection(sample.background_bytes)]
+        yield sample
@@ -0,0 +1,86 @@
+"""验证码识别耗时统计。"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator
+
+# 分位数只基于最近的样本计算，避免长时间运行后内存增长
+_WINDOW_SIZE = 256
+
+
+class LatencyStats:
+    """线程安全的耗时统计：累计次数/总耗时/最大值，以及最近样本的分位数。"""
+
+    def __init__(self, window: int = _WINDOW_SIZE) -> None:
+        self._lock = Lock()
+        self._recent: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self._recent.append(seconds)
+            if error:
+                self.errors += 1
+
+    @contextmanager
+    def timed(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(time.perf_counter() - start, error=True)
+            raise
+        self.record(time.perf_counter() - start)
+
+    def snapshot(self) -> dict[str, float | int]:
+        """返回毫秒单位的统计快照。"""
+        with self._lock:
+            recent = sorted(self._recent)
+            count = self.count
+            total = self.total
+            maximum = self.max
+            errors = self.errors
+
+        def percentile(ratio: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(ratio * len(recent)))] * 1000
+
+        return {
+            "count": count,
+            "errors": errors,
+            "avg_ms": round(total * 1000 / count, 2) if count else 0.0,
+            "p50_ms": round(percentile(0.5), 2),
+            "p95_ms": round(percentile(0.95), 2),
+            "max_ms": round(maximum * 1000, 2),
+        }
+
+
+_named_stats: dict[str, LatencyStats] = {}
+_named_stats_lock = Lock()
+
+
+def named_latency(name: str) -> LatencyStats:
+    """进程内按名称共享的耗时统计（如验证码组件的刷新/提交响应时间）。"""
+    with _named_stats_lock:
+        stats = _named_stats.get(name)
+        if stats is None:
+            stats = LatencyStats()
+            _named_stats[name] = stats
+        return stats
+
+
+def named_latency_snapshot() -> dict[str, dict[str, float | int]]:
+    with _named_stats_lock:
+        items = list(_named_stats.items())
+    return {name: stats.snapshot() for name, stats in items}
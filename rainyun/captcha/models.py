@@ -0,0 +1,267 @@
+"""进程级 ddddocr 模型注册表：OCR/DET 模型每个进程只加载一次，供所有账户共享。
+
+每种模型维护一个实例池（默认 1 个，可用 CAPTCHA_MODEL_POOL_SIZE 调大）。推理时从池中借出
+实例、用完归还，同一实例不会被两个线程同时使用；池满时其余线程排队等待。
+
+识别与检测均可直接传入已解码的 BGR ndarray：分类转为 PIL 图片，检测直接走模型的预处理与
+ONNX 推理，省去 JPEG 编码后再由 ddddocr 解码的往返。
+
+ndarray 检测依赖 ddddocr 1.5.6 的私有会话属性并复刻其 get_bbox 后处理（含阈值），因此
+requirements.txt 固定该版本；安装的版本不同或属性缺失时改走字节接口，并记录一次日志。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Any, Iterator
+
+import cv2
+import numpy as np
+
+from rainyun.captcha.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+MODEL_OCR = "ocr"
+MODEL_DET = "det"
+MODEL_KINDS = (MODEL_OCR, MODEL_DET)
+
+
+def _pool_size_from_env() -> int:
+    try:
+        return max(1, int(os.environ.get("CAPTCHA_MODEL_POOL_SIZE", "1")))
+    except ValueError:
+        return 1
+
+
+def _load_model(kind: str):
+    import ddddocr
+
+    if kind == MODEL_DET:
+        return ddddocr.DdddOcr(det=True, show_ad=False)
+    return ddddocr.DdddOcr(ocr=True, show_ad=False)
+
+
+def _to_pil(image: np.ndarray):
+    from PIL import Image
+
+    if image.ndim == 2:
+        return Image.fromarray(image)
+    return Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+
+def _clip_box(box, width: int, height: int) -> list[int]:
+    x_min, y_min, x_max, y_max = box
+    return [
+        0 if x_min < 0 else int(x_min),
+        0 if y_min < 0 else int(y_min),
+        width if x_max > width else int(x_max),
+        height if y_max > height else int(y_max),
+    ]
+
+
+# _detect_array 复刻的 get_bbox 实现所对应的 ddddocr 版本
+_SUPPORTED_DDDDOCR_VERSION = "1.5.6"
+_array_fallback_logged = False
+
+
+def _installed_ddddocr_version() -> str:
+    try:
+        return version("ddddocr")
+    except PackageNotFoundError:
+        return ""
+
+
+def _array_session(model):
+    """返回可直接推理的 ONNX 会话；版本不符或内部结构变化时返回 None（首次记录日志）。"""
+    global _array_fallback_logged
+    installed = _installed_ddddocr_version()
+    session = getattr(model, "_DdddOcr__ort_session", None) if installed == _SUPPORTED_DDDDOCR_VERSION else None
+    if session is None and not _array_fallback_logged:
+        _array_fallback_logged = True
+        logger.warning(
+            "ddddocr 版本 %s 与 ndarray 检测适配的 %s 不符或内部结构已变化，检测改走 PNG 编码的字节接口（较慢）",
+            installed or "未知",
+            _SUPPORTED_DDDDOCR_VERSION,
+        )
+    return session
+
+
+def _detect_array(model, image: np.ndarray) -> list[list[int]]:
+    """与 DdddOcr.get_bbox 相同的推理与后处理，输入为已解码的 BGR 图像。"""
+    session = _array_session(model)
+    if session is None:
+        return model.detection(cv2.imencode(".png", image)[1].tobytes())
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    tensor, ratio = model.preproc(image, (416, 416))
+    output = session.run(None, {session.get_inputs()[0].name: tensor[None, :, :, :]})
+    predictions = model.demo_postprocess(output[0], (416, 416))[0]
+    boxes = predictions[:, :4]
+    scores = predictions[:, 4:5] * predictions[:, 5:]
+    boxes_xyxy = np.ones_like(boxes)
+    boxes_xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2.0
+    boxes_xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2.0
+    boxes_xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2.0
+    boxes_xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2.0
+    boxes_xyxy /= ratio
+    pred = model.multiclass_nms(boxes_xyxy, scores, nms_thr=0.45, score_thr=0.1)
+    if pred is None:
+        return []
+    height, width = image.shape[:2]
+    return [_clip_box(box, width, height) for box in pred[:, :4].tolist()]
+
+
+def _dummy_image_bytes(width: int, height: int) -> bytes:
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    cv2.rectangle(image, (width // 4, height // 4), (width * 3 // 4, height * 3 // 4), (0, 0, 0), 2)
+    return cv2.imencode(".jpg", image)[1].tobytes()
+
+
+# 实例池耗尽时等待归还的轮询间隔（秒）
+_CHECKOUT_POLL_SECONDS = 1.0
+
+
+class _ModelPool:
+    def __init__(self, kind: str, size: int) -> None:
+        self.kind = kind
+        self.size = size
+        self._idle: Queue = Queue()
+        self._created = 0
+        self._lock = Lock()
+        self.load_stats = LatencyStats()
+        self.inference_stats = LatencyStats()
+
+    def _create(self):
+        logger.info("初始化 ddddocr(%s)", self.kind)
+        start = time.perf_counter()
+        model = _load_model(self.kind)
+        self.load_stats.record(time.perf_counter() - start)
+        return model
+
+    def _checkout(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except Empty:
+                pass
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                break
+            # 分段等待：其他线程创建失败时不会归还实例，需重新检查是否可以自行创建
+            try:
+                return self._idle.get(timeout=_CHECKOUT_POLL_SECONDS)
+            except Empty:
+                continue
+        try:
+            return self._create()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def borrow(self) -> Iterator[Any]:
+        model = self._checkout()
+        try:
+            yield model
+        finally:
+            self._idle.put(model)
+
+    @property
+    def loaded(self) -> int:
+        with self._lock:
+            return self._created
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.size,
+            "loaded": self.loaded,
+            "idle": self._idle.qsize(),
+            "load": self.load_stats.snapshot(),
+            "inference": self.inference_stats.snapshot(),
+        }
+
+
+class ModelRegistry:
+    """按模型类型管理实例池，并记录加载与推理耗时。"""
+
+    def __init__(self, pool_size: int | None = None) -> None:
+        size = pool_size or _pool_size_from_env()
+        self._pools = {kind: _ModelPool(kind, size) for kind in MODEL_KINDS}
+
+    def _pool(self, kind: str) -> _ModelPool:
+        pool = self._pools.get(kind)
+        if pool is None:
+            raise ValueError(f"未知模型类型: {kind}")
+        return pool
+
+    @contextmanager
+    def acquire(self, kind: str) -> Iterator[Any]:
+        with self._pool(kind).borrow() as model:
+            yield model
+
+    def classification(self, image: Any):
+        """image 可为图片字节、PIL 图片或 BGR ndarray。"""
+        if isinstance(image, np.ndarray):
+            image = _to_pil(image)
+        pool = self._pool(MODEL_OCR)
+        with pool.borrow() as model, pool.inference_stats.timed():
+            return model.classification(image)
+
+    def detection(self, image: bytes | np.ndarray):
+        """image 可为图片字节或 BGR ndarray。"""
+        pool = self._pool(MODEL_DET)
+        with pool.borrow() as model, pool.inference_stats.timed():
+            if isinstance(image, np.ndarray):
+                return _detect_array(model, image)
+            return model.detection(image)
+
+    def warm_up(self, kinds: tuple[str, ...] = MODEL_KINDS, inference: bool = True) -> None:
+        """加载模型；inference=True 时再跑一次空白图推理，让 ONNX 完成首次运行的初始化。"""
+        for kind in kinds:
+            pool = self._pool(kind)
+            with pool.borrow() as model:
+                if not inference:
+                    continue
+                if kind == MODEL_DET:
+                    model.detection(_dummy_image_bytes(320, 160))
+                else:
+                    model.classification(_dummy_image_bytes(100, 40))
+
+    def metrics(self) -> dict[str, Any]:
+        return {kind: pool.metrics() for kind, pool in self._pools.items()}
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def warm_up_models_in_background() -> None:
+    """在后台线程中预热模型，不阻塞调用方。"""
+
+    def run() -> None:
+        try:
+            get_model_registry().warm_up()
+            logger.info("OCR/DET 模型已预热")
+        except Exception as exc:
+            logger.warning("模型预热失败，将在首次识别时加载: %s", exc)
+
+    Thread(target=run, name="rainyun-model-warmup", daemon=True).start()
@@ -0,0 +1,249 @@
+"""本机共享验证码识别服务：由常驻进程持有 OCR/DET 模型，cron 拉起的签到进程通过 HTTP 调用，
+不必每次冷启动都重新加载模型。
+
+开启设置项 captcha_service 后：
+- Web 进程启动时在后台线程中承载服务（默认 127.0.0.1:8765，只接受本机连接）；
+  未启用 Web 面板时可单独运行 python -m rainyun.captcha.service。
+- process_captcha 先请求服务识别，服务不可用时回退进程内识别；与服务同进程时直接进程内识别。
+
+接口：
+- GET  /health → {"status": "ok", "pid": 进程号}
+- POST /solve  ← {"background": base64, "sprite": base64, "options": {...}}
+               → {"positions": [[x, y], ...] | null, "similarities": [...], "method": str,
+                  "alternatives": [{"positions": ..., "similarities": ...}, ...], "reason": str}
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any
+
+import requests
+
+from rainyun.utils.http import build_pooled_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+_CLIENT_TIMEOUT_SECONDS = 30
+# 服务不可达后暂停调用的时长，避免每次尝试都等待连接失败
+_UNAVAILABLE_BACKOFF_SECONDS = 60
+_MAX_BODY_BYTES = 8 * 1024 * 1024
+
+_server: ThreadingHTTPServer | None = None
+_server_lock = Lock()
+
+
+def _solve_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    from dataclasses import replace
+
+    from rainyun.captcha.cache import CaptchaAssets
+    from rainyun.config import get_default_config
+    from rainyun.main import LazyDdddOcr, SolverContext, build_captcha_solver, recognize_captcha
+    from rainyun.utils.image import decode_image_bytes, split_sprite_image
+
+    background_bytes = base64.b64decode(payload["background"])
+    sprite_bytes = base64.b64decode(payload["sprite"])
+    sprite_image = decode_image_bytes(sprite_bytes, "验证码小图")
+    options = payload.get("options") or {}
+    config = get_default_config()
+    config = replace(
+        config,
+        captcha_fused_solver=bool(options.get("fused", config.captcha_fused_solver)),
+        captcha_sift_weight=float(options.get("sift_weight", config.captcha_sift_weight)),
+        captcha_template_weight=float(options.get("template_weight", config.captcha_template_weight)),
+        captcha_save_samples=bool(options.get("save_samples", False)),
+    )
+    assets = CaptchaAssets(
+        background_bytes=background_bytes,
+        background=decode_image_bytes(background_bytes, "验证码背景图"),
+        sprite_image=sprite_image,
+        sprites=split_sprite_image(sprite_image),
+        sprite_bytes=sprite_bytes,
+    )
+    ctx = SolverContext(ocr=LazyDdddOcr(det=False), det=LazyDdddOcr(det=True), config=config)
+    outcome = recognize_captcha(ctx, assets, build_captcha_solver(config))
+    result = outcome.result
+    return {
+        "positions": [list(point) for point in result.positions] if result else None,
+        "similarities": list(result.similarities) if result else [],
+        "method": result.method if result else "",
+        "alternatives": [
+            {"positions": [list(point) for point in item.positions], "similarities": list(item.similarities)}
+            for item in (result.alternatives if result else [])
+        ],
+        "reason": outcome.reason,
+    }
+
+
+class _SolverHandler(BaseHTTPRequestHandler):
+    server_version = "RainyunCaptcha/1.0"
+
+    def _send_json(self, status: int, body: dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "pid": os.getpid()})
+            return
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/solve":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length <= 0 or length > _MAX_BODY_BYTES:
+                self._send_json(400, {"error": "请求体大小无效"})
+                return
+            payload = json.loads(self.rfile.read(length))
+            self._send_json(200, _solve_payload(payload))
+        except (KeyError, TypeError, ValueError) as exc:
+            self._send_json(400, {"error": str(exc)})
+        except Exception as exc:
+            logger.exception("验证码识别服务处理失败: %s", exc)
+            self._send_json(500, {"error": str(exc)})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("验证码识别服务 %s - %s", self.address_string(), format % args)
+
+
+def service_address() -> tuple[str, int]:
+    host = os.environ.get("CAPTCHA_SERVICE_HOST", DEFAULT_HOST).strip() or DEFAULT_HOST
+    try:
+        port = int(os.environ.get("CAPTCHA_SERVICE_PORT", DEFAULT_PORT))
+    except ValueError:
+        port = DEFAULT_PORT
+    return host, port
+
+
+def service_url() -> str:
+    """客户端访问地址：CAPTCHA_SERVICE_URL 优先，否则与服务端监听地址一致。"""
+    url = os.environ.get("CAPTCHA_SERVICE_URL", "").strip()
+    if url:
+        return url
+    host, port = service_address()
+    return f"http://{host}:{port}"
+
+
+def is_local_service_running() -> bool:
+    """当前进程是否承载了识别服务（此时直接进程内识别，无需绕行 HTTP）。"""
+    return _server is not None
+
+
+def start_service_in_background(warm_up: bool = True) -> ThreadingHTTPServer | None:
+    """在当前进程的后台线程中启动识别服务；端口被占用时返回 None。"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        host, port = service_address()
+        try:
+            server = ThreadingHTTPServer((host, port), _SolverHandler)
+        except OSError as exc:
+            logger.warning("验证码识别服务启动失败 %s:%s: %s", host, port, exc)
+            return None
+        server.daemon_threads = True
+        _server = server
+    Thread(target=server.serve_forever, name="rainyun-captcha-service", daemon=True).start()
+    logger.info("验证码识别服务已启动: http://%s:%s", host, port)
+    if warm_up:
+        from rainyun.captcha.models import warm_up_models_in_background
+
+        warm_up_models_in_background()
+    return server
+
+
+def stop_service() -> None:
+    global _server
+    with _server_lock:
+        server, _server = _server, None
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+class RemoteSolverClient:
+    """识别服务客户端；请求失败时返回 None，由调用方回退进程内识别。"""
+
+    def __init__(self, base_url: str, timeout: float = _CLIENT_TIMEOUT_SECONDS) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session = build_pooled_session()
+        # 本机服务不经过 HTTP(S)_PROXY
+        self._session.trust_env = False
+        self._unavailable_until = 0.0
+
+    def solve(self, background_bytes: bytes, sprite_bytes: bytes, options: dict[str, Any]) -> dict | None:
+        if time.monotonic() < self._unavailable_until:
+            return None
+        payload = {
+            "background": base64.b64encode(background_bytes).decode("ascii"),
+            "sprite": base64.b64encode(sprite_bytes).decode("ascii"),
+            "options": options,
+        }
+        try:
+            response = self._session.post(f"{self.base_url}/solve", json=payload, timeout=self.timeout)
+        except requests.RequestException as exc:
+            logger.warning("验证码识别服务不可用，%s 秒内改为进程内识别: %s", _UNAVAILABLE_BACKOFF_SECONDS, exc)
+            self._unavailable_until = time.monotonic() + _UNAVAILABLE_BACKOFF_SECONDS
+            return None
+        if response.status_code != 200:
+            logger.warning("验证码识别服务返回 %s: %s", response.status_code, response.text[:200])
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            logger.warning("验证码识别服务响应无法解析")
+            return None
+
+
+_clients: dict[str, RemoteSolverClient] = {}
+_clients_lock = Lock()
+
+
+def get_remote_solver(base_url: str) -> RemoteSolverClient | None:
+    if not base_url or is_local_service_running():
+        return None
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            client = RemoteSolverClient(base_url)
+            _clients[base_url] = client
+        return client
+
+
+def main() -> None:
+    from rainyun.data.store import DataStore
+
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+    store = DataStore()
+    store.load()
+    if not store.get_settings().captcha_service:
+        logger.info("未开启共享验证码识别服务，退出")
+        return
+    server = start_service_in_background(warm_up=True)
+    if server is None:
+        raise SystemExit(1)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stop_service()
+
+
+if __name__ == "__main__":
+    main()
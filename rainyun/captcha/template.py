@@ -0,0 +1,59 @@
+"""批量模板相似度：一次矩阵运算得到所有 小图 × 候选框 的归一化互相关。
+
+原实现逐对把小图缩放到候选框尺寸后调用 cv2.matchTemplate（同尺寸时只有一个输出值，
+即 TM_CCOEFF_NORMED，等价于两图去均值后的余弦相似度）。这里改为把所有候选框缩放到
+小图尺寸后堆叠成 (候选框数, 像素数) 的张量，去均值、按行单位化，再与小图做一次矩阵乘。
+三张小图由同一张图切分，尺寸通常一致；尺寸不同的小图按尺寸分组各算一次。
+
+缩放方向与原实现相反（候选框 → 小图），分数会有细微差别，但仍落在 [-1, 1] 且语义一致。
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+from rainyun.utils.image import normalize_gray
+
+# 去均值后模长低于该值视为纯色图，与任何图的相关性记为 0
+_FLAT_EPSILON = 1e-6
+
+
+def _normalize_rows(stack: np.ndarray) -> np.ndarray:
+    """按行去均值并单位化；纯色行置 0。"""
+
+    rows = stack.reshape(len(stack), -1).astype(np.float32)
+    rows -= rows.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    flat = norms[:, 0] < _FLAT_EPSILON
+    norms[flat] = 1.0
+    rows /= norms
+    rows[flat] = 0.0
+    return rows
+
+
+def template_similarity_matrix(sprites: Sequence[np.ndarray], specs: Sequence[np.ndarray]) -> np.ndarray:
+    """返回 (小图数, 候选框数) 的模板相似度矩阵，空小图整行为 0。"""
+
+    matrix = np.zeros((len(sprites), len(specs)), dtype=np.float64)
+    spec_grays = [normalize_gray(spec) for spec in specs]
+    valid_specs = [index for index, gray in enumerate(spec_grays) if gray is not None and gray.size > 0]
+    if not valid_specs:
+        return matrix
+    groups: dict[tuple[int, int], list[tuple[int, np.ndarray]]] = {}
+    for row, sprite in enumerate(sprites):
+        if sprite is None or sprite.size == 0:
+            continue
+        gray = normalize_gray(sprite)
+        groups.setdefault(gray.shape[:2], []).append((row, gray))
+    for (height, width), members in groups.items():
+        crops = np.stack([cv2.resize(spec_grays[index], (width, height)) for index in valid_specs])
+        crop_rows = _normalize_rows(crops)
+        sprite_rows = _normalize_rows(np.stack([gray for _, gray in members]))
+        scores = sprite_rows @ crop_rows.T
+        rows = [row for row, _ in members]
+        matrix[np.ix_(rows, valid_specs)] = scores
+    return matrix
+
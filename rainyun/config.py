@@ -258,6 +258,11 @@ class Config:
     captcha_retry_limit: int
     captcha_retry_unlimited: bool
     captcha_save_samples: bool
+    captcha_fused_solver: bool
+    captcha_sift_weight: float
+    captcha_template_weight: float
+    captcha_network_capture: bool
+    captcha_service: bool
     request_timeout: int
     max_retries: int
     retry_delay: float
@@ -298,6 +303,12 @@ class Config:
         captcha_retry_limit = 5
         captcha_retry_unlimited = False
         captcha_save_samples = False
+        # 融合分数与 check_answer 阈值（0.25，按单一策略分数调校）量纲不同，默认关闭
+        captcha_fused_solver = False
+        captcha_sift_weight = 0.5
+        captcha_template_weight = 0.5
+        captcha_network_capture = False
+        captcha_service = False
 
         request_timeout = 15
         max_retries = 3
@@ -338,6 +349,11 @@ class Config:
             captcha_retry_limit=captcha_retry_limit,
             captcha_retry_unlimited=captcha_retry_unlimited,
             captcha_save_samples=captcha_save_samples,
+            captcha_fused_solver=captcha_fused_solver,
+            captcha_sift_weight=captcha_sift_weight,
+            captcha_template_weight=captcha_template_weight,
+            captcha_network_capture=captcha_network_capture,
+            captcha_service=captcha_service,
             request_timeout=request_timeout,
             max_retries=max_retries,
             retry_delay=retry_delay,
@@ -381,6 +397,15 @@ class Config:
             payload.get("captcha_retry_unlimited"), base.captcha_retry_unlimited
         )
         captcha_save_samples = _coerce_bool_value(payload.get("captcha_save_samples"), base.captcha_save_samples)
+        captcha_fused_solver = _coerce_bool_value(payload.get("captcha_fused_solver"), base.captcha_fused_solver)
+        captcha_sift_weight = _coerce_float_value(payload.get("captcha_sift_weight"), base.captcha_sift_weight)
+        captcha_template_weight = _coerce_float_value(
+            payload.get("captcha_template_weight"), base.captcha_template_weight
+        )
+        captcha_network_capture = _coerce_bool_value(
+            payload.get("captcha_network_capture"), base.captcha_network_capture
+        )
+        captcha_service = _coerce_bool_value(payload.get("captcha_service"), base.captcha_service)
 
         request_timeout = _coerce_int_value(payload.get("request_timeout"), base.request_timeout)
         max_retries = _coerce_int_value(payload.get("max_retries"), base.max_retries)
@@ -439,6 +464,11 @@ class Config:
             captcha_retry_limit=captcha_retry_limit,
             captcha_retry_unlimited=captcha_retry_unlimited,
             captcha_save_samples=captcha_save_samples,
+            captcha_fused_solver=captcha_fused_solver,
+            captcha_sift_weight=captcha_sift_weight,
+            captcha_template_weight=captcha_template_weight,
+            captcha_network_capture=captcha_network_capture,
+            captcha_service=captcha_service,
             request_timeout=request_timeout,
             max_retries=max_retries,
             retry_delay=retry_delay,
@@ -483,6 +513,11 @@ class Config:
         captcha_retry_limit = base.captcha_retry_limit
         captcha_retry_unlimited = base.captcha_retry_unlimited
         captcha_save_samples = base.captcha_save_samples
+        captcha_fused_solver = base.captcha_fused_solver
+        captcha_sift_weight = base.captcha_sift_weight
+        captcha_template_weight = base.captcha_template_weight
+        captcha_network_capture = base.captcha_network_capture
+        captcha_service = base.captcha_service
         skip_push_title = base.skip_push_title
         push_config = DEFAULT_PUSH_CONFIG.copy()
         notify_channels: list[dict[str, Any]] = []
@@ -504,6 +539,11 @@ class Config:
                 settings, "captcha_retry_unlimited", captcha_retry_unlimited
             )
             captcha_save_samples = getattr(settings, "captcha_save_samples", captcha_save_samples)
+            captcha_fused_solver = getattr(settings, "captcha_fused_solver", captcha_fused_solver)
+            captcha_sift_weight = getattr(settings, "captcha_sift_weight", captcha_sift_weight)
+            captcha_template_weight = getattr(settings, "captcha_template_weight", captcha_template_weight)
+            captcha_network_capture = getattr(settings, "captcha_network_capture", captcha_network_capture)
+            captcha_service = getattr(settings, "captcha_service", captcha_service)
             skip_push_title = getattr(settings, "skip_push_title", skip_push_title)
             notify_config = getattr(settings, "notify_config", None)
             if isinstance(notify_config, Mapping):
@@ -558,6 +598,11 @@ class Config:
             captcha_retry_limit=captcha_retry_limit,
             captcha_retry_unlimited=captcha_retry_unlimited,
             captcha_save_samples=captcha_save_samples,
+            captcha_fused_solver=captcha_fused_solver,
+            captcha_sift_weight=captcha_sift_weight,
+            captcha_template_weight=captcha_template_weight,
+            captcha_network_capture=captcha_network_capture,
+            captcha_service=captcha_service,
             skip_push_title=skip_push_title,
             push_config=push_config,
             notify_channels=notify_channels,
@@ -151,6 +151,9 @@ class Account:
     last_checkin: str = ""
     last_status: str = "unknown"
     created_at: str = ""
+    # 最近一次续费检查回写：最早到期时间（Unix 时间戳，0 表示未知）与积分缺口
+    next_expiry: int = 0
+    points_shortage: int = 0
 
     @classmethod
     def from_dict(cls, data: Mapping[str, Any] | None) -> "Account":
@@ -167,6 +170,8 @@ class Account:
             last_checkin=_read_str(payload, "last_checkin", ""),
             last_status=_read_str(payload, "last_status", "unknown"),
             created_at=_read_str(payload, "created_at", ""),
+            next_expiry=_read_int(payload, "next_expiry", 0),
+            points_shortage=_read_int(payload, "points_shortage", 0),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -182,6 +187,8 @@ class Account:
             "last_checkin": self.last_checkin,
             "last_status": self.last_status,
             "created_at": self.created_at,
+            "next_expiry": self.next_expiry,
+            "points_shortage": self.points_shortage,
         }
 
 
@@ -204,6 +211,20 @@ class Settings:
     captcha_retry_limit: int = 5
     captcha_retry_unlimited: bool = False
     captcha_save_samples: bool = False
+    captcha_fused_solver: bool = False
+    captcha_sift_weight: float = 0.5
+    captcha_template_weight: float = 0.5
+    captcha_network_capture: bool = False
+    captcha_service: bool = False
+    checkin_workers: int = 1
+    checkin_resume: bool = True
+    checkin_precheck: bool = False
+    # 积分任务列表中“每日签到”任务的 ID；预检只认该任务的状态，未配置时预检不会跳过浏览器
+    checkin_task_id: int = 0
+    checkin_process_pool: bool = False
+    adaptive_concurrency: bool = False
+    worker_rss_limit_mb: int = 1024
+    account_leasing: bool = False
     skip_push_title: str = ""
     notify_config: dict[str, str] = field(default_factory=dict)
     notify_channels: list[dict[str, Any]] = field(default_factory=list)
@@ -228,6 +249,19 @@ class Settings:
             captcha_retry_limit=_read_int(payload, "captcha_retry_limit", 5),
             captcha_retry_unlimited=_read_bool(payload, "captcha_retry_unlimited", False),
             captcha_save_samples=_read_bool(payload, "captcha_save_samples", False),
+            captcha_fused_solver=_read_bool(payload, "captcha_fused_solver", False),
+            captcha_sift_weight=_read_float(payload, "captcha_sift_weight", 0.5),
+            captcha_template_weight=_read_float(payload, "captcha_template_weight", 0.5),
+            captcha_network_capture=_read_bool(payload, "captcha_network_capture", False),
+            captcha_service=_read_bool(payload, "captcha_service", False),
+            checkin_workers=_read_int(payload, "checkin_workers", 1),
+            checkin_resume=_read_bool(payload, "checkin_resume", True),
+            checkin_precheck=_read_bool(payload, "checkin_precheck", False),
+            checkin_task_id=_read_int(payload, "checkin_task_id", 0),
+            checkin_process_pool=_read_bool(payload, "checkin_process_pool", False),
+            adaptive_concurrency=_read_bool(payload, "adaptive_concurrency", False),
+            worker_rss_limit_mb=_read_int(payload, "worker_rss_limit_mb", 1024),
+            account_leasing=_read_bool(payload, "account_leasing", False),
             skip_push_title=_read_str(payload, "skip_push_title", ""),
             notify_config=_read_dict_str(payload, "notify_config"),
             notify_channels=_read_list_dict(payload, "notify_channels"),
@@ -251,6 +285,19 @@ class Settings:
             "captcha_retry_limit": self.captcha_retry_limit,
             "captcha_retry_unlimited": self.captcha_retry_unlimited,
             "captcha_save_samples": self.captcha_save_samples,
+            "captcha_fused_solver": self.captcha_fused_solver,
+            "captcha_sift_weight": self.captcha_sift_weight,
+            "captcha_template_weight": self.captcha_template_weight,
+            "captcha_network_capture": self.captcha_network_capture,
+            "captcha_service": self.captcha_service,
+            "checkin_workers": self.checkin_workers,
+            "checkin_resume": self.checkin_resume,
+            "checkin_precheck": self.checkin_precheck,
+            "checkin_task_id": self.checkin_task_id,
+            "checkin_process_pool": self.checkin_process_pool,
+            "adaptive_concurrency": self.adaptive_concurrency,
+            "worker_rss_limit_mb": self.worker_rss_limit_mb,
+            "account_leasing": self.account_leasing,
             "skip_push_title": self.skip_push_title,
             "notify_config": dict(self.notify_config),
             "notify_channels": list(self.notify_channels),
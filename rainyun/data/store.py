@@ -5,8 +5,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, Iterator, Mapping
 
 from .models import Account, ConfigData, DEFAULT_DATA_PATH, Settings
 
@@ -32,6 +33,11 @@ class DataStore:
             self.data = data
             return data
 
+        data = self._read()
+        self.data = data
+        return data
+
+    def _read(self) -> ConfigData:
         try:
             raw_text = self.path.read_text(encoding="utf-8").strip()
             raw = json.loads(raw_text) if raw_text else {}
@@ -41,7 +47,6 @@ class DataStore:
 
         data = ConfigData.from_dict(raw)
         self._validate_unique_ids(data.accounts)
-        self.data = data
         return data
 
     def save(self) -> None:
@@ -82,6 +87,26 @@ class DataStore:
                 return
         raise KeyError(f"账户不存在: {account.id}")
 
+    def update_account_fields(self, account_id: str, fields: Mapping[str, Any]) -> None:
+        """多节点共享数据卷时使用：文件锁内重新读取磁盘数据，只改写指定字段后保存。
+
+        避免用本进程的旧快照覆盖其他节点（或 Web 面板）同时写入的内容。
+        """
+
+        with self._file_lock():
+            fresh = self._read() if self.path.exists() else self._require_loaded()
+            target = next((item for item in fresh.accounts if item.id == account_id), None)
+            if target is None:
+                raise KeyError(f"账户不存在: {account_id}")
+            for key, value in fields.items():
+                setattr(target, key, value)
+            self._atomic_write(fresh)
+        if self.data is not None:
+            current = next((item for item in self.data.accounts if item.id == account_id), None)
+            if current is not None:
+                for key, value in fields.items():
+                    setattr(current, key, value)
+
     def delete_account(self, account_id: str, save: bool = True) -> bool:
         data = self._require_loaded()
         for index, item in enumerate(data.accounts):
@@ -122,6 +147,21 @@ class DataStore:
             logger.error("账户 id 重复: %s", dup_text)
             raise ValueError(f"账户 id 重复: {dup_text}")
 
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        try:
+            import fcntl
+        except Exception:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
     def _atomic_write(self, data: ConfigData) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = self.path.with_name(f"{self.path.name}.tmp")
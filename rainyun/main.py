@@ -5,48 +5,60 @@ import re
 import shutil
 import time
 from collections import deque
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from itertools import combinations, permutations
-from threading import Lock
+from threading import Lock, local
 from typing import Protocol, Sequence
 
 import cv2
-import ddddocr
 import numpy as np
 from .api.client import RainyunAPI
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
 
 from .config import Config, get_default_config
 from .data.store import DataStore
 from .browser.cookies import load_cookies
 from .browser.locators import XPATH_CONFIG
+from .browser.network import attach_network_capture
 from .browser.pages import LoginPage, RewardPage
 from .browser.session import BrowserSession, RuntimeContext
-from .utils.http import download_bytes, download_to_file
-from .utils.image import decode_image_bytes, encode_image_bytes, normalize_gray, split_sprite_image
-
-# 用户日志前缀（用于多账号区分）
-_LOG_USER_PREFIX = ""
+from .captcha.assignment import best_per_sprite, rank_assignments
+from .captcha.batching import get_inference_batcher
+from .captcha.cache import CaptchaAssets, get_solution_cache
+from .captcha.metrics import named_latency
+from .captcha.models import MODEL_DET, MODEL_OCR, ModelRegistry, get_model_registry
+from .captcha.service import get_remote_solver, service_url
+from .captcha.sift import DescriptorMatcher, SiftFeatureExtractor, sift_similarity_matrix
+from .captcha.template import template_similarity_matrix
+from .utils.http import build_pooled_session, download_bytes, download_to_file
+from .utils.image import (
+    crop_boxes,
+    decode_image_bytes,
+    encode_image_bytes,
+    split_sprite_image,
+)
+
+# 用户日志前缀（用于多账号区分；按线程隔离，支持多浏览器并发签到）
+_LOG_USER_PREFIX = local()
 
 
 def _set_log_user(user: str | None) -> None:
-    global _LOG_USER_PREFIX
     if user:
-        _LOG_USER_PREFIX = f"用户 {user} "
+        _LOG_USER_PREFIX.value = f"用户 {user} "
     else:
-        _LOG_USER_PREFIX = ""
+        _LOG_USER_PREFIX.value = ""
 
 
 def _set_log_prefix(prefix: str) -> None:
-    global _LOG_USER_PREFIX
-    _LOG_USER_PREFIX = prefix
+    _LOG_USER_PREFIX.value = prefix
 
 
 def _get_log_prefix() -> str:
-    return _LOG_USER_PREFIX
+    return getattr(_LOG_USER_PREFIX, "value", "")
 
 
 # 自定义异常：验证码处理过程中可重试的错误
@@ -56,31 +68,35 @@ class CaptchaRetryableError(Exception):
 
 
 class LazyDdddOcr:
-    """延迟初始化的 ddddocr，只有首次调用才创建实例。"""
+    """进程级模型注册表的轻量句柄：模型首次调用时加载，所有句柄共享同一份模型。"""
 
-    def __init__(self, *, det: bool = False) -> None:
+    def __init__(self, *, det: bool = False, registry: ModelRegistry | None = None) -> None:
         self._det = det
-        self._instance: ddddocr.DdddOcr | None = None
-
-    def _ensure(self) -> ddddocr.DdddOcr:
-        if self._instance is None:
-            if self._det:
-                logging.getLogger(__name__).info(f"{_get_log_prefix()}初始化 ddddocr(det)")
-                self._instance = ddddocr.DdddOcr(det=True, show_ad=False)
-            else:
-                logging.getLogger(__name__).info(f"{_get_log_prefix()}初始化 ddddocr(ocr)")
-                self._instance = ddddocr.DdddOcr(ocr=True, show_ad=False)
-        return self._instance
-
-    def classification(self, image_bytes: bytes):
+        self._registry = registry
+
+    @property
+    def registry(self) -> ModelRegistry:
+        return self._registry or get_model_registry()
+
+    def _backend(self):
+        # 开启批处理时经由共享调度线程推理，否则直接从模型池借用实例
+        if self._registry is not None:
+            return self._registry
+        return get_inference_batcher() or get_model_registry()
+
+    def warm_up(self) -> None:
+        """提前加载模型并试跑一次推理（常驻进程启动时调用，避免首次识别时再加载）。"""
+        self.registry.warm_up((MODEL_DET,) if self._det else (MODEL_OCR,))
+
+    def classification(self, image):
         if self._det:
             raise AttributeError("当前实例为 det 模式，无法调用 classification")
-        return self._ensure().classification(image_bytes)
+        return self._backend().classification(image)
 
-    def detection(self, image_bytes: bytes):
+    def detection(self, image):
         if not self._det:
             raise AttributeError("当前实例为 ocr 模式，无法调用 detection")
-        return self._ensure().detection(image_bytes)
+        return self._backend().detection(image)
 
 try:
     from .notify import configure, send
@@ -152,6 +168,8 @@ class MatchResult:
     positions: list[tuple[int, int]]
     similarities: list[float]
     method: str
+    # 按排序依次次优的分配；首选答案未通过且组件仍停留在同一张图时依次改交
+    alternatives: list["MatchResult"] = field(default_factory=list)
 
 
 class CaptchaMatcher(Protocol):
@@ -196,15 +214,110 @@ class StrategyCaptchaSolver:
         return None
 
 
+_captcha_pool: ThreadPoolExecutor | None = None
+_captcha_pool_lock = Lock()
+
+
+def _get_captcha_pool() -> ThreadPoolExecutor:
+    # OpenCV/NumPy/ONNX 计算时释放 GIL，检测与各匹配器可在线程中真正并行
+    global _captcha_pool
+    with _captcha_pool_lock:
+        if _captcha_pool is None:
+            _captcha_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rainyun-captcha")
+        return _captcha_pool
+
+
+def _submit_with_log_prefix(fn, *args) -> Future:
+    """提交到识别线程池，并在工作线程中沿用当前账户的日志前缀。"""
+    prefix = _get_log_prefix()
+
+    def run():
+        _set_log_prefix(prefix)
+        return fn(*args)
+
+    return _get_captcha_pool().submit(run)
+
+
+class FusedCaptchaSolver:
+    """并行计算各匹配器的相似度矩阵，按权重融合后只求解一次分配。"""
+
+    name = "fused"
+
+    def __init__(self, weighted_matchers: Sequence[tuple[CaptchaMatcher, float]]) -> None:
+        self.weighted_matchers = [
+            (matcher, float(weight))
+            for matcher, weight in weighted_matchers
+            if weight > 0 and getattr(matcher, "available", True)
+        ]
+
+    def _fused_matrix(self, sprites: list[np.ndarray], specs: list[np.ndarray]) -> np.ndarray:
+        prefix = _get_log_prefix()
+        futures = [
+            (matcher, weight, _submit_with_log_prefix(matcher.similarity_matrix, sprites, specs))
+            for matcher, weight in self.weighted_matchers
+        ]
+        fused = np.zeros((len(sprites), len(specs)), dtype=np.float64)
+        total_weight = 0.0
+        for matcher, weight, future in futures:
+            try:
+                matrix = future.result()
+            except Exception as e:
+                logger.warning(f"{prefix}验证码匹配策略失败: {matcher.name}: {e}")
+                continue
+            # 各策略分数量纲不同（模板相关系数可为负），统一截断到 [0, 1] 再加权
+            fused += weight * np.clip(np.nan_to_num(matrix, nan=0.0), 0.0, 1.0)
+            total_weight += weight
+        if total_weight <= 0:
+            return fused
+        return fused / total_weight
+
+    def solve(
+        self,
+        background: np.ndarray,
+        sprites: list[np.ndarray],
+        bboxes: list[tuple[int, int, int, int]],
+    ) -> MatchResult | None:
+        if not self.weighted_matchers:
+            return None
+        result = build_match_result(background, sprites, bboxes, self._fused_matrix, self.name)
+        if result:
+            summary = " + ".join(f"{matcher.name}×{weight:g}" for matcher, weight in self.weighted_matchers)
+            logger.info(f"{_get_log_prefix()}验证码融合匹配: {summary}")
+        return result
+
+
+def build_captcha_solver(config: Config) -> CaptchaSolver:
+    sift_matcher = SiftMatcher()
+    template_matcher = TemplateMatcher()
+    if config.captcha_fused_solver:
+        solver = FusedCaptchaSolver(
+            [
+                (sift_matcher, config.captcha_sift_weight),
+                (template_matcher, config.captcha_template_weight),
+            ]
+        )
+        if solver.weighted_matchers:
+            return solver
+        logger.warning(f"{_get_log_prefix()}融合匹配权重均无效，改用顺序匹配")
+    return StrategyCaptchaSolver([sift_matcher, template_matcher])
+
+
 class SiftMatcher:
     name = "sift"
 
     def __init__(self) -> None:
         self._sift = cv2.SIFT_create() if hasattr(cv2, "SIFT_create") else None
+        self.available = self._sift is not None
         if not self._sift:
             prefix = _get_log_prefix()
             logger.warning(f"{prefix}SIFT 不可用，将跳过 SiftMatcher")
 
+        # 匹配器跨多次尝试复用；特征缓存按次创建
+        self._matcher = DescriptorMatcher()
+
+    def similarity_matrix(self, sprites: list[np.ndarray], specs: list[np.ndarray]) -> np.ndarray:
+        return sift_similarity_matrix(sprites, specs, SiftFeatureExtractor(self._sift), self._matcher)
+
     def match(
         self,
         background: np.ndarray,
@@ -213,17 +326,15 @@ class SiftMatcher:
     ) -> MatchResult | None:
         if not self._sift:
             return None
-        return build_match_result(
-            background,
-            sprites,
-            bboxes,
-            lambda sprite, spec: compute_sift_similarity(sprite, spec, self._sift),
-            self.name,
-        )
+        return build_match_result(background, sprites, bboxes, self.similarity_matrix, self.name)
 
 
 class TemplateMatcher:
     name = "template"
+    available = True
+
+    def similarity_matrix(self, sprites: list[np.ndarray], specs: list[np.ndarray]) -> np.ndarray:
+        return template_similarity_matrix(sprites, specs)
 
     def match(
         self,
@@ -231,32 +342,29 @@ class TemplateMatcher:
         sprites: list[np.ndarray],
         bboxes: list[tuple[int, int, int, int]],
     ) -> MatchResult | None:
-        return build_match_result(
-            background,
-            sprites,
-            bboxes,
-            compute_template_similarity,
-            self.name,
-        )
+        return build_match_result(background, sprites, bboxes, self.similarity_matrix, self.name)
 
 
 def temp_path(ctx: RuntimeContext, filename: str) -> str:
     return os.path.join(ctx.temp_dir, filename)
 
 
-def clear_temp_dir(temp_dir: str) -> None:
-    if not os.path.exists(temp_dir):
-        return
-    for filename in os.listdir(temp_dir):
-        file_path = os.path.join(temp_dir, filename)
-        if os.path.isfile(file_path) or os.path.islink(file_path):
-            os.remove(file_path)
-
-
 def download_image(url: str, output_path: str, config: Config) -> bool:
     return download_to_file(url, output_path, config, log=logger)
 
 
+_download_sessions = local()
+
+
+def _get_download_session():
+    # 每个线程一个 Session（cookie 不跨线程共享），底层连接池进程内共享，验证码图片走 keep-alive
+    session = getattr(_download_sessions, "session", None)
+    if session is None:
+        session = build_pooled_session()
+        _download_sessions.session = session
+    return session
+
+
 def download_image_bytes(url: str, config: Config, fallback_path: str | None = None) -> bytes:
     prefix = _get_log_prefix()
     try:
@@ -266,13 +374,21 @@ def download_image_bytes(url: str, config: Config, fallback_path: str | None = N
             max_retries=config.download_max_retries,
             retry_delay=config.download_retry_delay,
             log=logger,
+            session=_get_download_session(),
         )
     except RuntimeError as e:
         if fallback_path:
             logger.warning(f"{prefix}内存下载失败，尝试降级为文件下载")
-            if download_image(url, fallback_path, config):
-                with open(fallback_path, "rb") as f:
-                    return f.read()
+            try:
+                if download_image(url, fallback_path, config):
+                    with open(fallback_path, "rb") as f:
+                        return f.read()
+            finally:
+                # 降级文件读入内存后即删除，不在临时目录中跨次累积
+                try:
+                    os.remove(fallback_path)
+                except OSError:
+                    pass
         raise CaptchaRetryableError(f"验证码图片下载失败: {e}")
 
 
@@ -322,53 +438,31 @@ def detect_captcha_bboxes(
     captcha_image: np.ndarray,
 ) -> list[tuple[int, int, int, int]]:
     prefix = _get_log_prefix()
-    payloads = [
-        ("raw", captcha_bytes),
-        ("reencode", encode_image_bytes(captcha_image, "验证码背景图")),
-    ]
+    # 优先直接检测已解码的图像；两种输入解码结果相同，只有出错时才改用原始字节
+    payloads = [("array", captcha_image), ("raw", captcha_bytes)]
     for label, payload in payloads:
         try:
             bboxes = ctx.det.detection(payload)
-            if bboxes:
-                logger.info(f"{prefix}验证码检测成功({label}): {len(bboxes)} 个候选框")
-                return bboxes
-            logger.warning(f"{prefix}验证码检测结果为空({label})")
         except Exception as e:
             logger.warning(f"{prefix}验证码检测失败({label}): {e}")
+            continue
+        if bboxes:
+            logger.info(f"{prefix}验证码检测成功({label}): {len(bboxes)} 个候选框")
+        else:
+            logger.warning(f"{prefix}验证码检测结果为空({label})")
+        return bboxes
     return []
 
 
-def compute_sift_similarity(sprite: np.ndarray, spec: np.ndarray, sift) -> float:
-    sprite_gray = normalize_gray(sprite)
-    spec_gray = normalize_gray(spec)
-    kp1, des1 = sift.detectAndCompute(sprite_gray, None)
-    kp2, des2 = sift.detectAndCompute(spec_gray, None)
-    if des1 is None or des2 is None:
-        return 0.0
-    bf = cv2.BFMatcher()
-    matches = bf.knnMatch(des1, des2, k=2)
-    good = [m for m_n in matches if len(m_n) == 2 for m, n in [m_n] if m.distance < 0.8 * n.distance]
-    if not matches or len(good) == 0:
-        return 0.0
-    return len(good) / len(matches)
-
-
-def compute_template_similarity(sprite: np.ndarray, spec: np.ndarray) -> float:
-    sprite_gray = normalize_gray(sprite)
-    spec_gray = normalize_gray(spec)
-    if sprite_gray is None or spec_gray is None or sprite_gray.size == 0 or spec_gray.size == 0:
-        return 0.0
-    if sprite_gray.shape != spec_gray.shape:
-        sprite_gray = cv2.resize(sprite_gray, (spec_gray.shape[1], spec_gray.shape[0]))
-    result = cv2.matchTemplate(spec_gray, sprite_gray, cv2.TM_CCOEFF_NORMED)
-    return float(np.max(result))
+# 每次识别保留的候选分配数（首选 + 次优），首选未通过时可在同一张图上继续尝试
+_ANSWER_CANDIDATES = 3
 
 
 def build_match_result(
     background: np.ndarray,
     sprites: list[np.ndarray],
     bboxes: list[tuple[int, int, int, int]],
-    similarity_fn,
+    matrix_fn,
     method: str,
 ) -> MatchResult | None:
     prefix = _get_log_prefix()
@@ -378,68 +472,36 @@ def build_match_result(
     if len(sprites) != 3:
         logger.warning(f"{prefix}验证码小图数量异常: {len(sprites)}")
         return None
-    best_positions: list[tuple[int, int] | None] = [None, None, None]
-    best_scores: list[float | None] = [None, None, None]
-    valid_specs: list[tuple[tuple[int, int], np.ndarray]] = []
-    for bbox in bboxes:
-        if len(bbox) != 4:
-            continue
-        x1, y1, x2, y2 = map(int, bbox)
-        if x2 <= x1 or y2 <= y1:
-            continue
-        spec = background[y1:y2, x1:x2]
-        if spec.size == 0:
-            continue
-        center = (int((x1 + x2) / 2), int((y1 + y2) / 2))
-        valid_specs.append((center, spec))
+    valid_specs = crop_boxes(background, bboxes)
     if not valid_specs:
         return None
+    sim_matrix = matrix_fn(sprites, [spec for _, spec in valid_specs])
     if len(valid_specs) < len(sprites):
-        for center, spec in valid_specs:
-            for index, sprite in enumerate(sprites):
-                if sprite is None or sprite.size == 0:
-                    continue
-                similarity = similarity_fn(sprite, spec)
-                if best_scores[index] is None or similarity > best_scores[index]:
-                    best_scores[index] = similarity
-                    best_positions[index] = center
-    else:
-        sim_matrix: list[list[float]] = []
-        for sprite in sprites:
-            row: list[float] = []
-            for _, spec in valid_specs:
-                if sprite is None or sprite.size == 0:
-                    row.append(0.0)
-                    continue
-                row.append(similarity_fn(sprite, spec))
-            sim_matrix.append(row)
-
-        best_perm: tuple[int, ...] | None = None
-        best_scores_local: list[float] | None = None
-        best_key: tuple[float, float, float] | None = None
-        bbox_indices = range(len(valid_specs))
-        for chosen in combinations(bbox_indices, len(sprites)):
-            for perm in permutations(chosen):
-                scores = [sim_matrix[i][perm[i]] for i in range(len(sprites))]
-                min_score = min(scores)
-                avg_score = sum(scores) / len(scores)
-                sum_score = sum(scores)
-                key = (min_score, avg_score, sum_score)
-                if best_key is None or key > best_key:
-                    best_key = key
-                    best_perm = perm
-                    best_scores_local = scores
-        if best_perm is not None and best_scores_local is not None:
-            for sprite_index, bbox_index in enumerate(best_perm):
-                center, _ = valid_specs[bbox_index]
-                best_positions[sprite_index] = center
-                best_scores[sprite_index] = best_scores_local[sprite_index]
-    if any(pos is None for pos in best_positions):
+        # 候选框不足：每个小图独立取最佳框
+        if any(sprite is None or sprite.size == 0 for sprite in sprites):
+            return None
+        chosen = best_per_sprite(sim_matrix)
+        return MatchResult(
+            positions=[valid_specs[box][0] for box in chosen],
+            similarities=[float(sim_matrix[index, box]) for index, box in enumerate(chosen)],
+            method=method,
+        )
+    ranked = rank_assignments(sim_matrix, top_k=_ANSWER_CANDIDATES)
+    if not ranked:
         return None
+    results = [
+        MatchResult(
+            positions=[valid_specs[box][0] for box in assignment.boxes],
+            similarities=list(assignment.scores),
+            method=method,
+        )
+        for assignment in ranked
+    ]
     return MatchResult(
-        positions=[pos for pos in best_positions if pos is not None],
-        similarities=[float(score) if score is not None else 0.0 for score in best_scores],
+        positions=results[0].positions,
+        similarities=results[0].similarities,
         method=method,
+        alternatives=results[1:],
     )
 
 
@@ -452,6 +514,72 @@ def log_match_result(result: MatchResult) -> None:
         )
 
 
+@dataclass
+class SolverContext:
+    """识别阶段所需的最小上下文（无浏览器），识别服务用它复用 check_captcha 等函数。"""
+
+    ocr: LazyDdddOcr
+    det: LazyDdddOcr
+    config: Config
+
+
+@dataclass(frozen=True)
+class CaptchaRecognition:
+    result: MatchResult | None
+    # 失败原因：low_confidence / no_bboxes / match_failed，识别成功时为空
+    reason: str = ""
+
+
+def recognize_captcha(
+    ctx: RuntimeContext | SolverContext, assets: CaptchaAssets, solver: CaptchaSolver
+) -> CaptchaRecognition:
+    """置信度检查、目标检测与匹配；进程内识别与识别服务共用。"""
+    # 检测与小图置信度检查互不依赖，并行执行；置信度不足时直接丢弃检测结果
+    detection = _submit_with_log_prefix(detect_captcha_bboxes, ctx, assets.background_bytes, assets.background)
+    if not check_captcha(ctx, assets.background, assets.sprites):
+        detection.cancel()
+        return CaptchaRecognition(None, "low_confidence")
+    bboxes = detection.result()
+    if not bboxes:
+        return CaptchaRecognition(None, "no_bboxes")
+    result = solver.solve(assets.background, assets.sprites, bboxes)
+    return CaptchaRecognition(result, "" if result else "match_failed")
+
+
+def recognize_with_service(ctx: RuntimeContext, assets: CaptchaAssets) -> CaptchaRecognition | None:
+    """交给共享识别服务识别；未启用或服务不可用时返回 None，由调用方在进程内识别。"""
+    if not ctx.config.captcha_service:
+        return None
+    client = get_remote_solver(service_url())
+    if client is None:
+        return None
+    sprite_bytes = assets.sprite_bytes or encode_image_bytes(assets.sprite_image, "验证码小图")
+    options = {
+        "fused": ctx.config.captcha_fused_solver,
+        "sift_weight": ctx.config.captcha_sift_weight,
+        "template_weight": ctx.config.captcha_template_weight,
+        "save_samples": ctx.config.captcha_save_samples,
+    }
+    response = client.solve(assets.background_bytes, sprite_bytes, options)
+    if response is None:
+        return None
+    method = f"service:{response.get('method') or 'unknown'}"
+
+    def parse(item: dict, alternatives: list[MatchResult] | None = None) -> MatchResult:
+        return MatchResult(
+            positions=[(int(x), int(y)) for x, y in item["positions"]],
+            similarities=[float(value) for value in item.get("similarities") or []],
+            method=method,
+            alternatives=alternatives or [],
+        )
+
+    result = None
+    if response.get("positions"):
+        alternatives = [parse(item) for item in response.get("alternatives") or [] if item.get("positions")]
+        result = parse(response, alternatives)
+    return CaptchaRecognition(result, str(response.get("reason") or ("" if result else "match_failed")))
+
+
 def process_captcha(ctx: RuntimeContext, retry_count: int = 0):
     """
     处理验证码逻辑（循环实现，避免递归栈溢出）
@@ -466,16 +594,26 @@ def process_captcha(ctx: RuntimeContext, retry_count: int = 0):
 
     def refresh_captcha() -> bool:
         try:
-            reload_btn = ctx.driver.find_element(*XPATH_CONFIG["CAPTCHA_RELOAD"])
-            time.sleep(2)
+            old_url = _current_captcha_url(ctx.driver)
+            reload_btn = ctx.wait.until(EC.element_to_be_clickable(XPATH_CONFIG["CAPTCHA_RELOAD"]))
+            start = time.perf_counter()
             reload_btn.click()
-            time.sleep(2)
+            try:
+                # 以背景图地址变化作为刷新完成的信号
+                WebDriverWait(ctx.driver, _WIDGET_TIMEOUT_SECONDS, poll_frequency=_WIDGET_POLL_SECONDS).until(
+                    lambda driver: _current_captcha_url(driver) not in ("", old_url)
+                )
+                _record_widget_timing("refresh", start)
+            except TimeoutException:
+                _record_widget_timing("refresh", start, error=True)
+                logger.warning(f"{prefix}刷新后 {_WIDGET_TIMEOUT_SECONDS} 秒内验证码图片未更新，继续尝试")
             return True
         except Exception as refresh_error:
             logger.error(f"{prefix}无法刷新验证码，放弃重试: {refresh_error}")
             return False
 
-    solver = StrategyCaptchaSolver([SiftMatcher(), TemplateMatcher()])
+    solver = build_captcha_solver(ctx.config)
+    cache = get_solution_cache()
     current_retry = retry_count
     try:
         while True:
@@ -486,62 +624,40 @@ def process_captcha(ctx: RuntimeContext, retry_count: int = 0):
                 logger.info(f"{prefix}无限重试模式，当前第 {current_retry + 1} 次尝试")
 
             try:
-                captcha_bytes, captcha_image, sprites = download_captcha_assets(ctx)
-                if check_captcha(ctx, captcha_image, sprites):
+                assets = download_captcha_assets(ctx)
+                captcha_image, sprites = assets.background, assets.sprites
+                cached_positions = cache.lookup(assets.key)
+                if cached_positions:
+                    logger.info(f"{prefix}验证码命中答案缓存，跳过识别直接提交")
+                    if submit_captcha_answer(ctx, captcha_image, cached_positions):
+                        logger.info(f"{prefix}验证码通过")
+                        cache.record_success(assets.key, cached_positions)
+                        return True
+                    logger.error(f"{prefix}缓存答案未通过，正在重试")
+                    cache.record_failure(assets.key, cached_positions)
+                else:
                     logger.info(f"{prefix}开始识别验证码 (第 {current_retry + 1} 次尝试)")
-                    bboxes = detect_captcha_bboxes(ctx, captcha_bytes, captcha_image)
-                    if not bboxes:
+                    recognition = recognize_with_service(ctx, assets) or recognize_captcha(ctx, assets, solver)
+                    result = recognition.result
+                    if recognition.reason == "low_confidence":
+                        logger.error(f"{prefix}当前验证码识别率低，尝试刷新")
+                    elif recognition.reason == "no_bboxes":
                         logger.error(f"{prefix}验证码检测失败，正在重试")
                         save_captcha_samples(captcha_image, sprites, config=ctx.config, reason="no_bboxes")
+                    elif result is None:
+                        logger.error(f"{prefix}验证码匹配失败，正在重试")
+                        save_captcha_samples(captcha_image, sprites, config=ctx.config, reason="match_failed")
                     else:
-                        result = solver.solve(captcha_image, sprites, bboxes)
-                        if result:
-                            log_match_result(result)
-                            if check_answer(result):
-                                for position in result.positions:
-                                    slide_bg = ctx.wait.until(
-                                        EC.visibility_of_element_located(XPATH_CONFIG["CAPTCHA_BG"])
-                                    )
-                                    style = slide_bg.get_attribute("style")
-                                    x, y = position
-                                    width_raw, height_raw = captcha_image.shape[1], captcha_image.shape[0]
-                                    try:
-                                        width = get_width_from_style(style)
-                                        height = get_height_from_style(style)
-                                    except ValueError:
-                                        width, height = get_element_size(slide_bg)
-                                    x_offset, y_offset = float(-width / 2), float(-height / 2)
-                                    final_x = int(x_offset + x / width_raw * width)
-                                    final_y = int(y_offset + y / height_raw * height)
-                                    ActionChains(ctx.driver).move_to_element_with_offset(
-                                        slide_bg, final_x, final_y
-                                    ).click().perform()
-                                confirm = ctx.wait.until(EC.element_to_be_clickable(XPATH_CONFIG["CAPTCHA_SUBMIT"]))
-                                logger.info(f"{prefix}提交验证码")
-                                confirm.click()
-                                time.sleep(5)
-                                result_el = ctx.wait.until(
-                                    EC.visibility_of_element_located(XPATH_CONFIG["CAPTCHA_OP"])
-                                )
-                                if 'show-success' in result_el.get_attribute("class"):
-                                    logger.info(f"{prefix}验证码通过")
-                                    return True
-                                logger.error(f"{prefix}验证码未通过，正在重试")
-                                save_captcha_samples(
-                                    captcha_image, sprites, config=ctx.config, reason="submit_failed"
-                                )
-                            else:
-                                logger.error(f"{prefix}验证码识别结果无效，正在重试")
-                                save_captcha_samples(
-                                    captcha_image, sprites, config=ctx.config, reason="answer_invalid"
-                                )
+                        log_match_result(result)
+                        if not check_answer(result):
+                            logger.error(f"{prefix}验证码识别结果无效，正在重试")
+                            save_captcha_samples(captcha_image, sprites, config=ctx.config, reason="answer_invalid")
+                        elif submit_ranked_answers(ctx, assets, result, cache):
+                            logger.info(f"{prefix}验证码通过")
+                            return True
                         else:
-                            logger.error(f"{prefix}验证码匹配失败，正在重试")
-                            save_captcha_samples(
-                                captcha_image, sprites, config=ctx.config, reason="match_failed"
-                            )
-                else:
-                    logger.error(f"{prefix}当前验证码识别率低，尝试刷新")
+                            logger.error(f"{prefix}验证码未通过，正在重试")
+                            save_captcha_samples(captcha_image, sprites, config=ctx.config, reason="submit_failed")
 
                 if not refresh_captcha():
                     return False
@@ -555,22 +671,186 @@ def process_captcha(ctx: RuntimeContext, retry_count: int = 0):
         _set_log_prefix(prev_prefix)
 
 
-def download_captcha_assets(ctx: RuntimeContext) -> tuple[bytes, np.ndarray, list[np.ndarray]]:
+# 验证码组件状态轮询：刷新与提交结果通常在数百毫秒内出现，超时后按原流程继续
+_WIDGET_TIMEOUT_SECONDS = 10
+_WIDGET_POLL_SECONDS = 0.1
+# 提交失败后等待组件复位（清除 show-* 状态）的时长，超时则视为不可在同一张图上重试
+_RETRY_SETTLE_SECONDS = 3
+
+
+def _current_captcha_url(driver) -> str:
+    try:
+        return get_url_from_style(driver.find_element(*XPATH_CONFIG["CAPTCHA_BG"]).get_attribute("style"))
+    except Exception:
+        return ""
+
+
+def _captcha_operation_class(driver) -> str:
+    try:
+        return driver.find_element(*XPATH_CONFIG["CAPTCHA_OP"]).get_attribute("class") or ""
+    except Exception:
+        return ""
+
+
+def _record_widget_timing(name: str, start: float, error: bool = False) -> None:
+    elapsed = time.perf_counter() - start
+    named_latency(f"widget_{name}").record(elapsed, error=error)
+    logger.info(f"{_get_log_prefix()}验证码{'刷新' if name == 'refresh' else '提交'}响应耗时 {elapsed * 1000:.0f} ms")
+
+
+def _widget_accepts_retry(ctx: RuntimeContext, image_url: str) -> bool:
+    """提交失败后组件是否复位且仍停留在同一张图上（此时可直接重新点选，无需刷新）。"""
+    try:
+        WebDriverWait(ctx.driver, _RETRY_SETTLE_SECONDS, poll_frequency=_WIDGET_POLL_SECONDS).until(
+            lambda driver: "show-" not in _captcha_operation_class(driver)
+            or _current_captcha_url(driver) != image_url
+        )
+    except TimeoutException:
+        return False
+    return bool(image_url) and _current_captcha_url(ctx.driver) == image_url
+
+
+def submit_ranked_answers(ctx: RuntimeContext, assets: CaptchaAssets, result: MatchResult, cache) -> bool:
+    """先提交首选答案，未通过且组件允许时依次改交次优分配；按名次记录提交耗时与通过率。"""
+    prefix = _get_log_prefix()
+    image_url = _current_captcha_url(ctx.driver)
+    submitted = False
+    for rank, candidate in enumerate([result, *result.alternatives], start=1):
+        if rank > 1 and not check_answer(candidate):
+            break
+        if cache.is_rejected(assets.key, candidate.positions):
+            logger.warning(f"{prefix}第 {rank} 候选答案与该验证码的已知错误答案相同，跳过提交")
+            continue
+        if submitted:
+            if not _widget_accepts_retry(ctx, image_url):
+                logger.info(f"{prefix}验证码组件已换图或未复位，放弃剩余候选答案")
+                break
+            logger.info(f"{prefix}首选答案未通过，改交第 {rank} 候选答案")
+            log_match_result(candidate)
+        start = time.perf_counter()
+        passed = submit_captcha_answer(ctx, assets.background, candidate.positions)
+        named_latency(f"answer_rank{rank}").record(time.perf_counter() - start, error=not passed)
+        submitted = True
+        if passed:
+            cache.record_success(assets.key, candidate.positions)
+            return True
+        cache.record_failure(assets.key, candidate.positions)
+    return False
+
+
+def submit_captcha_answer(ctx: RuntimeContext, captcha_image: np.ndarray, positions: list[tuple[int, int]]) -> bool:
+    """按背景图坐标依次点击并提交，返回验证码是否通过。"""
+    prefix = _get_log_prefix()
+    for position in positions:
+        slide_bg = ctx.wait.until(EC.visibility_of_element_located(XPATH_CONFIG["CAPTCHA_BG"]))
+        style = slide_bg.get_attribute("style")
+        x, y = position
+        width_raw, height_raw = captcha_image.shape[1], captcha_image.shape[0]
+        try:
+            width = get_width_from_style(style)
+            height = get_height_from_style(style)
+        except ValueError:
+            width, height = get_element_size(slide_bg)
+        x_offset, y_offset = float(-width / 2), float(-height / 2)
+        final_x = int(x_offset + x / width_raw * width)
+        final_y = int(y_offset + y / height_raw * height)
+        ActionChains(ctx.driver).move_to_element_with_offset(slide_bg, final_x, final_y).click().perform()
+    confirm = ctx.wait.until(EC.element_to_be_clickable(XPATH_CONFIG["CAPTCHA_SUBMIT"]))
+    before = _captcha_operation_class(ctx.driver)
+    logger.info(f"{prefix}提交验证码")
+    start = time.perf_counter()
+    confirm.click()
+    try:
+        # tcOperation 出现新的 show-* 状态类（成功/失败）即为校验完成
+        WebDriverWait(ctx.driver, _WIDGET_TIMEOUT_SECONDS, poll_frequency=_WIDGET_POLL_SECONDS).until(
+            lambda driver: (current := _captcha_operation_class(driver)) != before and "show-" in current
+        )
+        _record_widget_timing("submit", start)
+    except TimeoutException:
+        _record_widget_timing("submit", start, error=True)
+        logger.warning(f"{prefix}提交后 {_WIDGET_TIMEOUT_SECONDS} 秒内未收到校验结果")
+    result_el = ctx.wait.until(EC.visibility_of_element_located(XPATH_CONFIG["CAPTCHA_OP"]))
+    return 'show-success' in (result_el.get_attribute("class") or "")
+
+
+_download_pool: ThreadPoolExecutor | None = None
+_download_pool_lock = Lock()
+
+
+def _get_download_pool() -> ThreadPoolExecutor:
+    global _download_pool
+    with _download_pool_lock:
+        if _download_pool is None:
+            _download_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rainyun-download")
+        return _download_pool
+
+
+def _fetch_image(
+    url: str, config: Config, fallback_path: str, label: str, prefix: str
+) -> tuple[bytes, np.ndarray]:
+    _set_log_prefix(prefix)
+    image_bytes = download_image_bytes(url, config, fallback_path)
+    return image_bytes, decode_image_bytes(image_bytes, label)
+
+
+def capture_captcha_image(ctx: RuntimeContext, element, url: str, label: str) -> tuple[bytes, np.ndarray] | None:
+    """从浏览器已收到的响应中取图，取不到时退回元素截图；都失败返回 None。"""
+    prefix = _get_log_prefix()
+    image_bytes = ctx.network.response_body(url)
+    source = "网络响应"
+    if not image_bytes:
+        try:
+            image_bytes = element.screenshot_as_png
+            source = "元素截图"
+        except Exception as e:
+            logger.warning(f"{prefix}{label}截图失败: {e}")
+            return None
+    try:
+        image = decode_image_bytes(image_bytes, label)
+    except ValueError as e:
+        logger.warning(f"{prefix}{label}解码失败({source}): {e}")
+        return None
+    logger.info(f"{prefix}{label}取自{source}")
+    return image_bytes, image
+
+
+def download_captcha_assets(ctx: RuntimeContext) -> CaptchaAssets:
     prefix = _get_log_prefix()
-    clear_temp_dir(ctx.temp_dir)
     slide_bg = ctx.wait.until(EC.visibility_of_element_located(XPATH_CONFIG["CAPTCHA_BG"]))
-    img1_style = slide_bg.get_attribute("style")
-    img1_url = get_url_from_style(img1_style)
-    logger.info(f"{prefix}开始下载验证码图片(1): {img1_url}")
-    captcha_bytes = download_image_bytes(img1_url, ctx.config, temp_path(ctx, "captcha.jpg"))
+    img1_url = get_url_from_style(slide_bg.get_attribute("style"))
     sprite = ctx.wait.until(EC.visibility_of_element_located(XPATH_CONFIG["CAPTCHA_IMG_INSTRUCTION"]))
     img2_url = sprite.get_attribute("src")
-    logger.info(f"{prefix}开始下载验证码图片(2): {img2_url}")
-    sprite_bytes = download_image_bytes(img2_url, ctx.config, temp_path(ctx, "sprite.jpg"))
-    captcha_image = decode_image_bytes(captcha_bytes, "验证码背景图")
-    sprite_image = decode_image_bytes(sprite_bytes, "验证码小图")
+    if ctx.network is not None:
+        background = capture_captcha_image(ctx, slide_bg, img1_url, "验证码背景图")
+        sprite_result = capture_captcha_image(ctx, sprite, img2_url, "验证码小图")
+        if background and sprite_result:
+            return CaptchaAssets(
+                background_bytes=background[0],
+                background=background[1],
+                sprite_image=sprite_result[1],
+                sprites=split_sprite_image(sprite_result[1]),
+                sprite_bytes=sprite_result[0],
+            )
+        logger.warning(f"{prefix}浏览器内取图失败，改为重新下载")
+    # 先解析两张图的地址，再并行下载并各自解码
+    logger.info(f"{prefix}开始下载验证码图片: {img1_url} | {img2_url}")
+    pool = _get_download_pool()
+    background_future = pool.submit(
+        _fetch_image, img1_url, ctx.config, temp_path(ctx, "captcha.jpg"), "验证码背景图", prefix
+    )
+    sprite_future = pool.submit(
+        _fetch_image, img2_url, ctx.config, temp_path(ctx, "sprite.jpg"), "验证码小图", prefix
+    )
+    captcha_bytes, captcha_image = background_future.result()
+    sprite_bytes, sprite_image = sprite_future.result()
     sprites = split_sprite_image(sprite_image)
-    return captcha_bytes, captcha_image, sprites
+    return CaptchaAssets(
+        background_bytes=captcha_bytes,
+        background=captcha_image,
+        sprite_image=sprite_image,
+        sprites=sprites,
+        sprite_bytes=sprite_bytes,
+    )
 
 
 def save_captcha_samples(
@@ -610,8 +890,12 @@ def check_captcha(ctx: RuntimeContext, captcha_image: np.ndarray, sprites: list[
         return False
     low_confidence = 0
     for index, sprite in enumerate(sprites, start=1):
-        sprite_bytes = encode_image_bytes(sprite, f"验证码小图{index}")
-        if ctx.ocr.classification(sprite_bytes) in ["0", "1"]:
+        if sprite is None or sprite.size == 0:
+            raise ValueError(f"验证码小图{index} 为空，无法识别")
+        # 结论已确定时提前结束：已达 2 个低置信度，或剩余小图全部命中也不足 2 个
+        if low_confidence >= 2 or low_confidence + (len(sprites) - index + 1) < 2:
+            break
+        if ctx.ocr.classification(sprite) in ["0", "1"]:
             low_confidence += 1
             logger.warning(f"{prefix}验证码小图 {index} 识别为低置信度标记")
     if low_confidence >= 2:
@@ -644,7 +928,7 @@ def check_answer(result: MatchResult, min_similarity: float = 0.25) -> bool:
     return True
 
 
-def run_with_config(config: Config) -> bool:
+def run_with_config(config: Config, apply_delay: bool = True) -> bool:
     ctx = None
     driver = None
     temp_dir = None
@@ -686,9 +970,9 @@ def run_with_config(config: Config) -> bool:
             except Exception as e:
                 logger.warning(f"{prefix}获取初始积分失败: {e}")
 
-        delay = random.randint(0, max_delay)
-        delay_sec = random.randint(0, 60)
-        if not debug:
+        if apply_delay and not debug:
+            delay = random.randint(0, max_delay)
+            delay_sec = random.randint(0, 60)
             logger.info(f"{prefix}随机延时等待 {delay} 分钟 {delay_sec} 秒")
             time.sleep(delay * 60 + delay_sec)
         logger.info(f"{prefix}准备 OCR/DET（延迟初始化）")
@@ -704,7 +988,8 @@ def run_with_config(config: Config) -> bool:
             det=det,
             temp_dir=temp_dir,
             api=api_client,
-            config=config
+            config=config,
+            network=attach_network_capture(driver, config),
         )
 
         login_page = LoginPage(ctx, captcha_handler=process_captcha)
@@ -773,17 +1058,28 @@ def run_with_config(config: Config) -> bool:
 
 
 def run() -> None:
+    # 延迟导入：scheduler 包会反向导入本模块
+    from .scheduler.delay import build_start_schedule, sleep_until
+
     store = DataStore()
     data = store.load()
     if not data.accounts:
         logger.error("未配置任何账户，请先在 Web 面板中添加账户")
         return
 
-    for account in data.accounts:
-        if not account.enabled:
-            continue
+    accounts = [account for account in data.accounts if account.enabled]
+    # 每个账户独立随机启动时间，按到期顺序执行，避免延时逐个累加
+    schedule = build_start_schedule(
+        accounts,
+        max_delay=data.settings.max_delay,
+        debug=data.settings.debug,
+        labels=[account.name or account.username or account.id for account in accounts],
+    )
+    while (entry := schedule.pop()) is not None:
+        due_at, _, account = entry
+        sleep_until(due_at)
         config = Config.from_account(account, data.settings)
-        success = run_with_config(config)
+        success = run_with_config(config, apply_delay=False)
         account.last_checkin = datetime.now().isoformat()
         account.last_status = "success" if success else "failed"
         account_id = str(getattr(account, "id", "") or "").strip()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 import re
+from datetime import datetime, timedelta
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,20 @@ CRON_COMMAND = os.environ.get(
 
 _CRON_BASIC_PATTERN = re.compile(r"^([0-9*/,-]+\s+){4}[0-9*/,-]+$")
 
+# @ 别名对应的标准 5 段表达式
+_AT_EXPRESSION_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+# 分 时 日 月 周 的取值范围
+_CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# 向后搜索下次触发时间的上限（覆盖闰年 2 月 29 日等稀疏表达式）
+_NEXT_RUN_SEARCH_DAYS = 366 * 5
+
 
 def _resolve_log_path(path_value: str, fallback: str) -> str:
     try:
@@ -84,3 +99,84 @@ def write_cron_file(schedule: str | None, path: str | None = None) -> str:
     except Exception as exc:
         logger.warning("设置 cron 文件权限失败: %s", exc)
     return normalized
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        if not part:
+            raise ValueError(f"cron 字段为空: {field}")
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step <= 0:
+            raise ValueError(f"cron 步长无效: {part}")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_text, end_text = base.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(base)
+            end = high if step_text else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron 字段越界: {part}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """解析后的 cron 表达式，用于进程内调度计算触发时间。"""
+
+    def __init__(self, schedule: str | None) -> None:
+        self.expression = normalize_schedule(schedule)
+        fields = _AT_EXPRESSION_ALIASES.get(self.expression, self.expression).split()
+        minutes, hours, days, months, weekdays = (
+            _parse_cron_field(field, low, high)
+            for field, (low, high) in zip(fields, _CRON_FIELD_RANGES)
+        )
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        # 周日既可写 0 也可写 7
+        self.weekdays = {0 if value == 7 else value for value in weekdays}
+        self._day_any = fields[2] == "*"
+        self._weekday_any = fields[4] == "*"
+
+    def _match_day(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = (moment.isoweekday() % 7) in self.weekdays
+        # 与 cron 一致：日/周同时受限时任一命中即可
+        if not self._day_any and not self._weekday_any:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._match_day(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """返回严格晚于 moment 的下一次触发时间（精确到分钟）。"""
+
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=_NEXT_RUN_SEARCH_DAYS)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._match_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"cron 表达式无可用触发时间: {self.expression}")
+
+
+def next_run_time(schedule: str | None, after: datetime | None = None) -> datetime:
+    return CronSchedule(schedule).next_after(after or datetime.now())
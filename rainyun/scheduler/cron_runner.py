@@ -41,22 +41,37 @@ def _acquire_lock(lock_path: str) -> int | None:
         return None
 
 
-def main() -> int:
-    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
-    ensure_file_handler()
-    lock_path = os.environ.get("CRON_LOCK_PATH", "/tmp/rainyun-cron.lock")
-    fd = _acquire_lock(lock_path)
-    if fd is None:
-        logger.info("已有任务在执行中，跳过本次调度")
-        return 0
+def _leasing_enabled(store: DataStore) -> bool:
+    try:
+        data = store.load()
+    except Exception as exc:
+        logger.warning("读取配置失败，按单节点模式加锁执行: %s", exc)
+        return False
+    return bool(getattr(data.settings, "account_leasing", False))
+
+
+def run_job(store: DataStore | None = None, *, ocr=None, det=None) -> int:
+    """执行一次定时任务：签到 + 续费检查 + 汇总通知（带防重入锁）。
+
+    cron 模式每次由独立进程调用；常驻调度模式在进程内复用，并传入已预热的 ocr/det。
+    """
+    store = store or DataStore()
+    if _leasing_enabled(store):
+        # 租约模式：多个节点按账户分摊，不再使用全局互斥锁
+        fd = -1
+    else:
+        lock_path = os.environ.get("CRON_LOCK_PATH", "/tmp/rainyun-cron.lock")
+        fd = _acquire_lock(lock_path)
+        if fd is None:
+            logger.info("已有任务在执行中，跳过本次调度")
+            return 0
 
     try:
-        store = DataStore()
-        runner = MultiAccountRunner(store)
-        results = runner.run(delay=True)
+        runner = MultiAccountRunner(store, ocr=ocr, det=det)
+        # 续费检查只依赖 API，与浏览器签到并行执行
+        results, renew_results = runner.run_with_renew(delay=True)
         total = len(results)
         success = sum(1 for item in results if item.success)
-        renew_results = runner.run_renew()
         renew_total = len(renew_results)
         renew_success = sum(1 for item in renew_results if item.success)
         renew_checked = sum(1 for item in renew_results if item.has_api_key)
@@ -155,5 +170,11 @@ def main() -> int:
             os.close(fd)
 
 
+def main() -> int:
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+    ensure_file_handler()
+    return run_job()
+
+
 if __name__ == "__main__":
     sys.exit(main())
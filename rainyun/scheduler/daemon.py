@@ -0,0 +1,173 @@
+"""常驻调度模式：在进程内按 cron 表达式触发定时任务。
+
+与 cron 模式相比，重依赖（OpenCV/ddddocr/Selenium）与 OCR 模型只加载一次，
+每次触发直接复用，省去冷启动开销。cron 文件写入仅在 cron 模式下保留作为兜底。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from datetime import datetime
+from threading import Event, Lock, Thread
+
+from rainyun.data.store import DataStore
+from rainyun.scheduler.cron import CronSchedule
+from rainyun.web.logs import ensure_file_handler
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_MODE_CRON = "cron"
+SCHEDULER_MODE_DAEMON = "daemon"
+# 单次最长等待秒数：定期重新读取配置，感知 Web 面板修改的定时表达式
+_MAX_IDLE_SECONDS = 60
+
+
+def get_scheduler_mode() -> str:
+    mode = os.environ.get("SCHEDULER_MODE", SCHEDULER_MODE_CRON).strip().lower()
+    if mode not in (SCHEDULER_MODE_CRON, SCHEDULER_MODE_DAEMON):
+        logger.warning("SCHEDULER_MODE 无效: %s，回退 cron 模式", mode)
+        return SCHEDULER_MODE_CRON
+    return mode
+
+
+def is_daemon_mode() -> bool:
+    cron_enabled = os.environ.get("CRON_MODE", "false").strip().lower() == "true"
+    return cron_enabled and get_scheduler_mode() == SCHEDULER_MODE_DAEMON
+
+
+class SchedulerDaemon:
+    """后台线程：读取 settings.cron_schedule，到点调用 cron_runner.run_job。"""
+
+    def __init__(self, warm_up: bool = True) -> None:
+        self._warm_up = warm_up
+        self._stop = Event()
+        self._wakeup = Event()
+        self._thread: Thread | None = None
+        self._ocr = None
+        self._det = None
+        self.next_run: datetime | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._loop, name="rainyun-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    def reschedule(self) -> None:
+        """定时表达式变更后唤醒调度线程立即重新计算下次触发时间。"""
+        self._wakeup.set()
+
+    def _prepare(self) -> None:
+        from rainyun.main import LazyDdddOcr
+
+        # 模型在调度线程中创建并预热，跨多次运行复用
+
+        self._ocr = LazyDdddOcr(det=False)
+        self._det = LazyDdddOcr(det=True)
+        if self._warm_up:
+            try:
+                self._ocr.warm_up()
+                self._det.warm_up()
+                logger.info("常驻调度：OCR/DET 模型已预热")
+            except Exception as exc:
+                logger.warning("常驻调度：模型预热失败，将在首次识别时加载: %s", exc)
+
+    def _read_schedule(self) -> CronSchedule:
+        store = DataStore()
+        data = store.load()
+        return CronSchedule(data.settings.cron_schedule)
+
+    def _loop(self) -> None:
+        try:
+            self._prepare()
+        except Exception as exc:
+            logger.exception("常驻调度初始化失败: %s", exc)
+            return
+        expression: str | None = None
+        while not self._stop.is_set():
+            try:
+                schedule = self._read_schedule()
+            except Exception as exc:
+                logger.error("常驻调度读取定时配置失败: %s", exc)
+                self._stop.wait(_MAX_IDLE_SECONDS)
+                continue
+            if self.next_run is None or schedule.expression != expression:
+                expression = schedule.expression
+                self.next_run = schedule.next_after(datetime.now())
+                logger.info("常驻调度：计划 %s，下次执行 %s", expression, self.next_run)
+
+            wait_seconds = (self.next_run - datetime.now()).total_seconds()
+            if wait_seconds > 0:
+                self._wakeup.wait(min(wait_seconds, _MAX_IDLE_SECONDS))
+                self._wakeup.clear()
+                continue
+            due = self.next_run
+            self._run_once()
+            # 执行耗时可能跨过若干触发点，按结束时间重新计算，不补跑
+            self.next_run = schedule.next_after(max(datetime.now(), due))
+            logger.info("常驻调度：下次执行 %s", self.next_run)
+
+    def _run_once(self) -> None:
+        from rainyun.scheduler.cron_runner import run_job
+
+        logger.info("常驻调度：开始执行定时任务")
+        try:
+            run_job(ocr=self._ocr, det=self._det)
+        except Exception as exc:
+            logger.exception("常驻调度执行定时任务失败: %s", exc)
+
+
+_daemon: SchedulerDaemon | None = None
+_daemon_lock = Lock()
+
+
+def get_daemon() -> SchedulerDaemon | None:
+    return _daemon
+
+
+def start_daemon() -> SchedulerDaemon:
+    global _daemon
+    with _daemon_lock:
+        if _daemon is None:
+            warm_up = os.environ.get("SCHEDULER_WARMUP", "true").strip().lower() == "true"
+            _daemon = SchedulerDaemon(warm_up=warm_up)
+        _daemon.start()
+        return _daemon
+
+
+def stop_daemon() -> None:
+    with _daemon_lock:
+        if _daemon is not None:
+            _daemon.stop()
+
+
+def main() -> int:
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+    ensure_file_handler()
+    daemon = start_daemon()
+    try:
+        while daemon.is_alive():
+            daemon.join(1)
+    except KeyboardInterrupt:
+        stop_daemon()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
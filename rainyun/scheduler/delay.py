@@ -0,0 +1,100 @@
+"""随机延时调度：为每个账户独立分配启动时间。"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def pick_delay_seconds(max_delay: Any, debug: bool = False) -> int:
+    """按 max_delay（分钟）随机生成一次延时秒数，调试模式或配置无效时为 0。"""
+
+    if debug:
+        return 0
+    if not isinstance(max_delay, int) or isinstance(max_delay, bool) or max_delay <= 0:
+        return 0
+    return random.randint(0, max_delay) * 60 + random.randint(0, 60)
+
+
+class StartSchedule:
+    """按到期时间排序的启动队列（最小堆），可被多个工作线程共享。"""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Any]] = []
+        self._lock = Lock()
+
+    def push(self, due_at: float, index: int, item: Any) -> None:
+        with self._lock:
+            heapq.heappush(self._heap, (due_at, index, item))
+
+    def pop(self) -> tuple[float, int, Any] | None:
+        """取出最早到期的条目；队列为空返回 None。"""
+
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+    def entries(self) -> list[tuple[float, int, Any]]:
+        """按到期时间排序的条目快照（不出队）。"""
+
+        with self._lock:
+            return sorted(self._heap)
+
+
+def build_start_schedule(
+    items: Iterable[Any],
+    *,
+    max_delay: Any = 0,
+    debug: bool = False,
+    delay: bool = True,
+    labels: Iterable[str] | None = None,
+    ordered: bool = False,
+) -> StartSchedule:
+    """为每个条目随机分配启动时间（monotonic 时钟），不启用延时则全部立即到期。
+
+    ordered=True 时随机延时升序分配，保证靠前（优先级高）的条目先开始。
+    """
+
+    schedule = StartSchedule()
+    now = time.monotonic()
+    item_list = list(items)
+    label_list = list(labels) if labels is not None else None
+    delays = [pick_delay_seconds(max_delay, debug) if delay else 0 for _ in item_list]
+    if ordered:
+        delays.sort()
+    for index, item in enumerate(item_list):
+        delay_sec = delays[index]
+        if delay_sec > 0:
+            label = label_list[index] if label_list and index < len(label_list) else str(index + 1)
+            start_at = datetime.now() + timedelta(seconds=delay_sec)
+            logger.info(
+                "用户 %s 随机延时 %s 分钟 %s 秒，计划 %s 开始",
+                label,
+                delay_sec // 60,
+                delay_sec % 60,
+                start_at.strftime("%H:%M:%S"),
+            )
+        schedule.push(now + delay_sec, index, item)
+    return schedule
+
+
+def seconds_until(due_at: float) -> float:
+    return max(0.0, due_at - time.monotonic())
+
+
+def sleep_until(due_at: float) -> None:
+    remaining = seconds_until(due_at)
+    if remaining > 0:
+        time.sleep(remaining)
@@ -0,0 +1,137 @@
+"""签到运行日志：逐账户持久化执行进度，进程崩溃后可跳过已完成账户续跑。"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from uuid import uuid4
+
+from rainyun.data.models import DEFAULT_DATA_PATH
+
+logger = logging.getLogger(__name__)
+
+PHASE_START = "start"
+PHASE_CHECKIN = "checkin"
+PHASE_SKIP = "skip"
+PHASE_RENEW = "renew"
+# 续费检查结果：renewed 表示本次实际续费过服务器，checked 表示检查完成但无需/无法续费
+RENEW_OUTCOME_RENEWED = "renewed"
+RENEW_OUTCOME_CHECKED = "checked"
+# 视为“今日已完成”的签到结果：运行日志的 outcome 与账户的 last_status 都取自这些值
+COMPLETED_OUTCOMES = ("already_signed", "success")
+_RETENTION_DAYS = 7
+
+
+def _default_journal_dir() -> Path:
+    configured = os.environ.get("JOURNAL_DIR", "")
+    if configured:
+        return Path(configured)
+    data_path = Path(os.environ.get("DATA_PATH", DEFAULT_DATA_PATH))
+    return data_path.parent / "journal"
+
+
+@dataclass
+class JournalEntry:
+    run_id: str
+    account_id: str
+    phase: str
+    outcome: str
+    timestamp: str
+    message: str = ""
+
+
+class RunJournal:
+    """按天分文件追加写入（JSON Lines），每条记录落盘后才返回。"""
+
+    def __init__(self, directory: str | Path | None = None, run_id: str | None = None) -> None:
+        self.directory = Path(directory) if directory else _default_journal_dir()
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid4().hex[:6]}"
+        self._lock = Lock()
+
+    def _path_for(self, day: date) -> Path:
+        return self.directory / f"{day.isoformat()}.jsonl"
+
+    def record(self, account_id: str, phase: str, outcome: str, message: str = "") -> None:
+        entry = JournalEntry(
+            run_id=self.run_id,
+            account_id=account_id,
+            phase=phase,
+            outcome=outcome,
+            timestamp=datetime.now().isoformat(),
+            message=message,
+        )
+        line = json.dumps(asdict(entry), ensure_ascii=False)
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(self._path_for(date.today()), "a", encoding="utf-8") as handle:
+                    handle.write(line + "\n")
+                    handle.flush()
+                    os.fsync(handle.fileno())
+        except OSError as exc:
+            logger.warning("写入运行日志失败: %s", exc)
+
+    def entries(self, day: date | None = None) -> list[JournalEntry]:
+        path = self._path_for(day or date.today())
+        if not path.exists():
+            return []
+        results: list[JournalEntry] = []
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        payload = json.loads(line)
+                        results.append(JournalEntry(**payload))
+                    except (ValueError, TypeError):
+                        # 崩溃时可能留下半行，忽略即可
+                        continue
+        except OSError as exc:
+            logger.warning("读取运行日志失败: %s", exc)
+        return results
+
+    def completed_today(self) -> set[str]:
+        """今日已成功签到（或已确认签过）的账户 id。"""
+        return {
+            entry.account_id
+            for entry in self.entries()
+            if entry.phase in (PHASE_CHECKIN, PHASE_SKIP) and entry.outcome in COMPLETED_OUTCOMES
+        }
+
+    def renewed_today(self) -> set[str]:
+        """今日已实际续费过服务器的账户 id（任一节点、任一次运行）。"""
+        return {
+            entry.account_id
+            for entry in self.entries()
+            if entry.phase == PHASE_RENEW and entry.outcome == RENEW_OUTCOME_RENEWED
+        }
+
+    def prune(self, keep_days: int = _RETENTION_DAYS) -> None:
+        if not self.directory.exists():
+            return
+        cutoff = date.today() - timedelta(days=keep_days)
+        for path in self.directory.glob("*.jsonl"):
+            try:
+                if date.fromisoformat(path.stem) < cutoff:
+                    path.unlink()
+            except (ValueError, OSError):
+                continue
+
+
+def checked_in_today(account, now: datetime | None = None) -> bool:
+    """账户记录显示今日已成功签到。"""
+    if getattr(account, "last_status", "") not in COMPLETED_OUTCOMES:
+        return False
+    raw = getattr(account, "last_checkin", "") or ""
+    try:
+        last = datetime.fromisoformat(raw)
+    except ValueError:
+        return False
+    return last.date() == (now or datetime.now()).date()
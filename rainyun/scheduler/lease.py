@@ -0,0 +1,200 @@
+"""账户租约：多个节点共享 data 卷时按账户分摊任务。
+
+每个账户一个租约文件（O_EXCL 创建保证互斥），内容记录持有者与过期时间；
+持有期间后台线程定期续期，节点宕机后租约过期即可被其他节点接管。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import socket
+import time
+from pathlib import Path
+from threading import Event, Lock, Thread
+from uuid import uuid4
+
+from rainyun.data.models import DEFAULT_DATA_PATH
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL_SECONDS = 300
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _default_lease_dir() -> Path:
+    configured = os.environ.get("LEASE_DIR", "")
+    if configured:
+        return Path(configured)
+    data_path = Path(os.environ.get("DATA_PATH", DEFAULT_DATA_PATH))
+    return data_path.parent / "leases"
+
+
+def get_node_id() -> str:
+    """节点标识：优先 NODE_ID 环境变量，默认主机名（容器内即容器 ID）。"""
+    return os.environ.get("NODE_ID", "").strip() or socket.gethostname()
+
+
+class AccountLeases:
+    """单次运行持有的账户租约集合。"""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        node_id: str | None = None,
+        ttl: int = _DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.directory = Path(directory) if directory else _default_lease_dir()
+        self.node_id = node_id or get_node_id()
+        # 同一节点上的多个进程也需区分，持有者以 token 判定
+        self.token = f"{self.node_id}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.ttl = ttl
+        self._held: set[str] = set()
+        self._lock = Lock()
+        self._stop = Event()
+        self._heartbeat: Thread | None = None
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / f"{_UNSAFE_CHARS.sub('_', key)}.lease"
+
+    def _payload(self) -> str:
+        now = time.time()
+        return json.dumps(
+            {"owner": self.token, "node": self.node_id, "acquired_at": now, "expires_at": now + self.ttl}
+        )
+
+    def _read(self, path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _create(self, path: Path) -> bool:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(self._payload())
+            handle.flush()
+            os.fsync(handle.fileno())
+        return True
+
+    def _write(self, path: Path) -> None:
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex[:8]}.tmp")
+        tmp_path.write_text(self._payload(), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _is_stale(self, path: Path, lease: dict | None) -> bool:
+        if lease is not None:
+            expires_at = lease.get("expires_at")
+            return not isinstance(expires_at, (int, float)) or expires_at < time.time()
+        # 内容损坏（如写入途中宕机）：按文件修改时间判断
+        try:
+            return path.stat().st_mtime + self.ttl < time.time()
+        except OSError:
+            return False
+
+    def try_acquire(self, key: str) -> bool:
+        """尝试获取账户租约；已被其他节点持有且未过期时返回 False。"""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path_for(key)
+        if self._create(path):
+            self._remember(key)
+            return True
+        lease = self._read(path)
+        if lease is not None and lease.get("owner") == self.token:
+            self._write(path)
+            self._remember(key)
+            return True
+        if not self._is_stale(path, lease):
+            return False
+        return self._take_over(key, path)
+
+    def _take_over(self, key: str, path: Path) -> bool:
+        """接管过期租约：先以 O_EXCL 创建接管标记，保证同一时刻只有一个节点在接管。"""
+
+        marker = path.with_name(f"{path.name}.takeover")
+        if not self._create(marker):
+            if self._is_stale(marker, None):
+                # 接管过程中宕机遗留的标记
+                try:
+                    marker.unlink()
+                except OSError:
+                    pass
+            return False
+        try:
+            # 持有标记后重新确认：可能已被其他节点接管或原持有者已续期
+            lease = self._read(path)
+            if path.exists() and not self._is_stale(path, lease):
+                return False
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            holder = (lease or {}).get("node", "未知节点")
+            logger.info("接管过期租约 %s（原持有节点 %s）", key, holder)
+            if self._create(path):
+                self._remember(key)
+                return True
+            return False
+        finally:
+            try:
+                marker.unlink()
+            except OSError:
+                pass
+
+    def _remember(self, key: str) -> None:
+        with self._lock:
+            self._held.add(key)
+
+    def renew_all(self) -> None:
+        with self._lock:
+            keys = list(self._held)
+        for key in keys:
+            path = self._path_for(key)
+            lease = self._read(path)
+            if lease is None or lease.get("owner") != self.token:
+                logger.warning("租约 %s 已被其他节点接管，停止续期", key)
+                with self._lock:
+                    self._held.discard(key)
+                continue
+            try:
+                self._write(path)
+            except OSError as exc:
+                logger.warning("租约 %s 续期失败: %s", key, exc)
+
+    def release_all(self) -> None:
+        with self._lock:
+            keys = list(self._held)
+            self._held.clear()
+        for key in keys:
+            path = self._path_for(key)
+            lease = self._read(path)
+            if lease is not None and lease.get("owner") == self.token:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def start_heartbeat(self) -> None:
+        if self._heartbeat and self._heartbeat.is_alive():
+            return
+        self._stop.clear()
+        interval = max(1.0, self.ttl / 3)
+
+        def beat() -> None:
+            while not self._stop.wait(interval):
+                self.renew_all()
+
+        self._heartbeat = Thread(target=beat, name="rainyun-lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.join(5)
+        self.release_all()
@@ -0,0 +1,47 @@
+"""账户优先级：临近到期、积分缺口大、上次失败的账户优先处理。"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Sequence
+
+# 账户状态中视为“正常”的取值，其余（login_failed/异常信息等）视为上次失败
+_HEALTHY_STATUSES = ("success", "unknown", "")
+_SECONDS_PER_DAY = 86400
+
+
+def days_remaining(account: Any, now: float | None = None) -> float | None:
+    """按上次续费检查回写的最早到期时间计算剩余天数，未知返回 None。"""
+
+    expiry = getattr(account, "next_expiry", 0)
+    if not isinstance(expiry, int) or expiry <= 0:
+        return None
+    current = time.time() if now is None else now
+    return (expiry - current) / _SECONDS_PER_DAY
+
+
+def account_priority(account: Any, urgent_days: int, now: float | None = None) -> tuple:
+    """排序键（越小越优先）：到期紧迫 > 剩余天数 > 积分缺口 > 上次失败，剩余天数未知的排在最后。"""
+
+    remaining = days_remaining(account, now)
+    urgent = remaining is not None and remaining <= urgent_days
+    shortage = getattr(account, "points_shortage", 0)
+    if not isinstance(shortage, int):
+        shortage = 0
+    failed = str(getattr(account, "last_status", "") or "") not in _HEALTHY_STATUSES
+    return (
+        0 if urgent else 1,
+        remaining if remaining is not None else float("inf"),
+        -max(0, shortage),
+        0 if failed else 1,
+    )
+
+
+def order_by_priority(accounts: Sequence[Any], urgent_days: int, now: float | None = None) -> list[int]:
+    """返回按优先级排序后的下标列表，同优先级保持原有顺序。"""
+
+    current = time.time() if now is None else now
+    return sorted(
+        range(len(accounts)),
+        key=lambda index: (account_priority(accounts[index], urgent_days, current), index),
+    )
@@ -0,0 +1,171 @@
+"""进程池执行模式：每个工作进程常驻加载 OCR/DET 模型，串行处理多个账户任务。
+
+验证码识别（OpenCV/NumPy/ONNX）在独立进程中执行，不与其他账户争抢 GIL；
+单个进程崩溃只影响当前账户。工作进程超过 RSS 上限时处理完当前任务后自行退出，
+下一个任务到来时由父进程重新拉起。账户状态只由父进程回写存储。
+
+工作进程随单次签到运行创建与退出：常驻调度模式下同一进程内的多次运行各自重新拉起，
+cron 模式下每次运行本就是新进程，模型预热只在一次运行的多个账户之间复用。
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from rainyun.scheduler.resources import process_rss_mb
+
+logger = logging.getLogger(__name__)
+
+# 等待工作进程结果时的轮询间隔（秒），用于及时发现进程崩溃
+_POLL_SECONDS = 1.0
+_STOP_TIMEOUT_SECONDS = 10
+
+
+class WorkerCrashed(RuntimeError):
+    """工作进程在返回结果前退出。"""
+
+
+@dataclass
+class WorkerReply:
+    result: Any
+    last_checkin: str
+    last_status: str
+
+
+class _DetachedStore:
+    """工作进程内的占位存储：状态由父进程统一回写。"""
+
+    data = None
+
+    def update_account(self, account: Any, save: bool = True) -> None:
+        return None
+
+
+def _worker_main(conn, rss_limit_mb: int, warm_up: bool) -> None:
+    from rainyun.main import LazyDdddOcr
+    from rainyun.scheduler.runner import MultiAccountRunner
+    from rainyun.web.logs import ensure_file_handler
+
+    ensure_file_handler()
+    pid = os.getpid()
+    ocr = LazyDdddOcr(det=False)
+    det = LazyDdddOcr(det=True)
+    if warm_up:
+        try:
+            ocr.warm_up()
+            det.warm_up()
+            logger.info("工作进程 %s：OCR/DET 模型已预热", pid)
+        except Exception as exc:
+            logger.warning("工作进程 %s：模型预热失败，将在首次识别时加载: %s", pid, exc)
+    runner = MultiAccountRunner(_DetachedStore(), ocr=ocr, det=det)
+    parts = None
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                return
+            command = message[0]
+            if command == "stop":
+                return
+            if command == "release":
+                if parts is not None:
+                    runner.release_session(parts)
+                    parts = None
+                continue
+            _, account, settings, low_memory = message
+            result, parts = runner.checkin_with_session(account, settings, parts, low_memory=low_memory)
+            rss = process_rss_mb()
+            recycle = rss_limit_mb > 0 and rss > rss_limit_mb
+            conn.send(("done", WorkerReply(result, account.last_checkin, account.last_status), recycle))
+            if recycle:
+                logger.info("工作进程 %s 内存 %.0fMB 超过上限 %sMB，退出回收", pid, rss, rss_limit_mb)
+                return
+    finally:
+        if parts is not None:
+            runner.release_session(parts)
+        conn.close()
+
+
+class AccountWorker:
+    """父进程侧句柄：按需拉起工作进程，同步提交单个账户任务。"""
+
+    def __init__(self, rss_limit_mb: int = 0, warm_up: bool = True) -> None:
+        self._context = multiprocessing.get_context("spawn")
+        self._rss_limit_mb = rss_limit_mb
+        self._warm_up = warm_up
+        self._process = None
+        self._conn = None
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        self._discard()
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._rss_limit_mb, self._warm_up),
+            name="rainyun-checkin-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        logger.info("已启动签到工作进程 %s", process.pid)
+
+    def _discard(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        if self._process is not None:
+            self._process.join(_STOP_TIMEOUT_SECONDS)
+        self._process = None
+        self._conn = None
+
+    @property
+    def pid(self) -> int | None:
+        if self._process is not None and self._process.is_alive():
+            return self._process.pid
+        return None
+
+    def run_account(self, account: Any, settings: Any, low_memory: bool = False) -> WorkerReply:
+        self._ensure_started()
+        try:
+            self._conn.send(("run", account, settings, low_memory))
+            while not self._conn.poll(_POLL_SECONDS):
+                if not self._process.is_alive():
+                    raise WorkerCrashed(f"工作进程 {self._process.pid} 退出码 {self._process.exitcode}")
+            _, reply, recycle = self._conn.recv()
+        except (EOFError, OSError) as exc:
+            self._discard()
+            raise WorkerCrashed(str(exc)) from exc
+        except WorkerCrashed:
+            self._discard()
+            raise
+        if recycle:
+            self._discard()
+        return reply
+
+    def release_browser(self) -> None:
+        if self._conn is not None and self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(("release",))
+            except OSError:
+                self._discard()
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._conn.send(("stop",))
+            except OSError:
+                pass
+            self._process.join(_STOP_TIMEOUT_SECONDS)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._discard()
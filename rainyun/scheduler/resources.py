@@ -0,0 +1,261 @@
+"""主机资源采样与自适应并发控制。
+
+可用内存取 cgroup 限额余量与 /proc/meminfo MemAvailable 的较小值（容器内以 cgroup 为准），
+CPU 以 cgroup 配额折算核数并结合 1 分钟负载；浏览器会话内存按 chromedriver 进程树 RSS 估算。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from threading import Condition
+
+logger = logging.getLogger(__name__)
+
+_CGROUP_ROOT = "/sys/fs/cgroup"
+# cgroup v2 “无限制”与 v1 的超大默认值
+_CGROUP_UNLIMITED = 1 << 60
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return handle.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int_file(path: str) -> int | None:
+    text = _read_text(path)
+    if text is None or text == "max":
+        return None
+    try:
+        return int(text.split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def cgroup_memory_headroom_mb() -> float | None:
+    """cgroup 内存限额 - 当前用量（MB），未设置限额返回 None。"""
+
+    for limit_path, usage_path in (
+        (f"{_CGROUP_ROOT}/memory.max", f"{_CGROUP_ROOT}/memory.current"),
+        (f"{_CGROUP_ROOT}/memory/memory.limit_in_bytes", f"{_CGROUP_ROOT}/memory/memory.usage_in_bytes"),
+    ):
+        limit = _read_int_file(limit_path)
+        usage = _read_int_file(usage_path)
+        if limit is None or usage is None or limit >= _CGROUP_UNLIMITED:
+            continue
+        return max(0, limit - usage) / (1024 * 1024)
+    return None
+
+
+def meminfo_available_mb() -> float | None:
+    text = _read_text("/proc/meminfo")
+    if not text:
+        return None
+    for line in text.splitlines():
+        if line.startswith("MemAvailable:"):
+            try:
+                return int(line.split()[1]) / 1024
+            except (ValueError, IndexError):
+                return None
+    return None
+
+
+def available_memory_mb() -> float | None:
+    candidates = [value for value in (cgroup_memory_headroom_mb(), meminfo_available_mb()) if value is not None]
+    return min(candidates) if candidates else None
+
+
+def effective_cpu_count() -> float:
+    """按 cgroup CPU 配额折算的可用核数。"""
+
+    quota = None
+    text = _read_text(f"{_CGROUP_ROOT}/cpu.max")
+    if text:
+        parts = text.split()
+        if len(parts) == 2 and parts[0] != "max":
+            try:
+                quota = int(parts[0]) / int(parts[1])
+            except (ValueError, ZeroDivisionError):
+                quota = None
+    if quota is None:
+        cfs_quota = _read_int_file(f"{_CGROUP_ROOT}/cpu/cpu.cfs_quota_us")
+        cfs_period = _read_int_file(f"{_CGROUP_ROOT}/cpu/cpu.cfs_period_us")
+        if cfs_quota and cfs_quota > 0 and cfs_period:
+            quota = cfs_quota / cfs_period
+    host = float(os.cpu_count() or 1)
+    return min(host, quota) if quota else host
+
+
+def load_per_cpu() -> float | None:
+    try:
+        return os.getloadavg()[0] / effective_cpu_count()
+    except (OSError, AttributeError):
+        return None
+
+
+def process_rss_mb(pid: int | str = "self") -> float:
+    """读取 /proc/<pid>/status 中的 VmRSS（MB），不可用时返回 0。"""
+
+    text = _read_text(f"/proc/{pid}/status")
+    if not text:
+        return 0.0
+    for line in text.splitlines():
+        if line.startswith("VmRSS:"):
+            try:
+                return int(line.split()[1]) / 1024
+            except (ValueError, IndexError):
+                return 0.0
+    return 0.0
+
+
+def _children_map() -> dict[int, list[int]]:
+    children: dict[int, list[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        text = _read_text(f"/proc/{entry}/stat")
+        if not text:
+            continue
+        # comm 字段可能含空格，取最后一个右括号之后的字段
+        fields = text[text.rfind(")") + 2 :].split()
+        try:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (ValueError, IndexError):
+            continue
+    return children
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """进程及其全部子孙进程的 RSS 之和（MB），用于估算单个浏览器会话占用。"""
+
+    children = _children_map()
+    total = 0.0
+    stack = [pid]
+    seen: set[int] = set()
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        total += process_rss_mb(current)
+        stack.extend(children.get(current, []))
+    return total
+
+
+@dataclass
+class ResourceSnapshot:
+    available_mb: float | None
+    load_per_cpu: float | None
+
+
+def take_snapshot() -> ResourceSnapshot:
+    return ResourceSnapshot(available_mb=available_memory_mb(), load_per_cpu=load_per_cpu())
+
+
+class AdaptiveConcurrency:
+    """动态信号量：按可用内存与 CPU 负载在 [min_slots, max_slots] 之间调整并发会话数。"""
+
+    # 预留给系统/Python 主进程的内存
+    _RESERVE_MB = 256
+    # 单会话内存初始估算（首个会话实测后按 EWMA 修正）
+    _DEFAULT_SESSION_MB = 400
+    _EWMA_ALPHA = 0.3
+    # 1 分钟负载/核数 超过上限收缩、低于下限才允许扩张
+    _LOAD_HIGH = 1.5
+    _LOAD_LOW = 0.8
+    _ADJUST_INTERVAL_SECONDS = 5
+
+    def __init__(self, max_slots: int, min_slots: int = 1, sampler=take_snapshot) -> None:
+        self.max_slots = max(1, max_slots)
+        self.min_slots = max(1, min(min_slots, self.max_slots))
+        self.session_mb = float(self._DEFAULT_SESSION_MB)
+        self._sampler = sampler
+        self._condition = Condition()
+        self._active = 0
+        self._limit = self.min_slots
+        self._last_adjust = 0.0
+        self._last_snapshot = ResourceSnapshot(None, None)
+        self.adjust(force=True)
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def observe_session(self, rss_mb: float) -> None:
+        """记录一个会话的实测内存占用。"""
+
+        if rss_mb <= 0:
+            return
+        with self._condition:
+            self.session_mb = (1 - self._EWMA_ALPHA) * self.session_mb + self._EWMA_ALPHA * rss_mb
+
+    def low_memory(self) -> bool:
+        """余量不足以再容纳两个会话时建议启用 Chrome 低内存模式。"""
+
+        available = self._last_snapshot.available_mb
+        if available is None:
+            return False
+        return available - self._RESERVE_MB < self.session_mb * 2
+
+    def adjust(self, force: bool = False) -> int:
+        now = time.monotonic()
+        with self._condition:
+            if not force and now - self._last_adjust < self._ADJUST_INTERVAL_SECONDS:
+                return self._limit
+            self._last_adjust = now
+            snapshot = self._sampler()
+            self._last_snapshot = snapshot
+            limit = self.max_slots
+            if snapshot.available_mb is not None:
+                spare = int((snapshot.available_mb - self._RESERVE_MB) // max(self.session_mb, 1))
+                # 已在运行的会话内存已计入用量，只需为新增会话留出余量
+                limit = min(limit, self._active + max(0, spare))
+            if snapshot.load_per_cpu is not None:
+                if snapshot.load_per_cpu > self._LOAD_HIGH:
+                    limit = min(limit, max(self._active - 1, self.min_slots))
+                elif snapshot.load_per_cpu > self._LOAD_LOW:
+                    limit = min(limit, max(self._limit, self.min_slots))
+            limit = max(self.min_slots, min(self.max_slots, limit))
+            if limit != self._limit:
+                logger.info(
+                    "自适应并发：%s -> %s（可用内存 %s MB，单会话约 %.0f MB，负载/核 %s）",
+                    self._limit,
+                    limit,
+                    "未知" if snapshot.available_mb is None else f"{snapshot.available_mb:.0f}",
+                    self.session_mb,
+                    "未知" if snapshot.load_per_cpu is None else f"{snapshot.load_per_cpu:.2f}",
+                )
+                self._limit = limit
+                self._condition.notify_all()
+            return self._limit
+
+    def try_acquire(self) -> bool:
+        self.adjust()
+        with self._condition:
+            if self._active < self._limit:
+                self._active += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        while not self.try_acquire():
+            with self._condition:
+                self._condition.wait(self._ADJUST_INTERVAL_SECONDS)
+
+    def release(self) -> None:
+        with self._condition:
+            self._active = max(0, self._active - 1)
+            self._condition.notify()
@@ -1,22 +1,47 @@
-"""多账户串行调度执行。"""
+"""多账户调度执行（支持多浏览器并发）。"""
 
 from __future__ import annotations
 
 import logging
-import random
 import time
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Any
+from threading import Event, Lock, Thread
+from typing import Any, Iterator
 
 from rainyun.api.client import RainyunAPI
+from rainyun.api.reward import probe_daily_reward
 from rainyun.browser.cookies import load_cookies
+from rainyun.browser.network import attach_network_capture
 from rainyun.browser.pages import LoginPage, RewardPage
 from rainyun.browser.session import BrowserSession, RuntimeContext
 from rainyun.config import Config
 from rainyun.data.store import DataStore
+from rainyun.scheduler.delay import (
+    StartSchedule,
+    build_start_schedule,
+    pick_delay_seconds,
+    seconds_until,
+    sleep_until,
+)
+from rainyun.scheduler.journal import (
+    PHASE_CHECKIN,
+    PHASE_RENEW,
+    PHASE_SKIP,
+    PHASE_START,
+    RENEW_OUTCOME_CHECKED,
+    RENEW_OUTCOME_RENEWED,
+    RunJournal,
+    checked_in_today,
+)
+from rainyun.scheduler.lease import AccountLeases
+from rainyun.scheduler.priority import days_remaining, order_by_priority
+from rainyun.scheduler.process_pool import AccountWorker, WorkerCrashed
+from rainyun.scheduler.resources import AdaptiveConcurrency, process_tree_rss_mb
 from rainyun.server.manager import ServerManager
 from rainyun.main import LazyDdddOcr, process_captcha
 
@@ -54,10 +79,40 @@ class AccountRenewResult:
 
 
 class MultiAccountRunner:
-    """串行执行启用账户并回写结果。"""
+    """按浏览器工作池执行启用账户并回写结果。"""
 
-    def __init__(self, store: DataStore) -> None:
+    # 距离下一个账户开始超过该秒数时先关闭浏览器，避免空等期间占用内存
+    _IDLE_CLOSE_SECONDS = 120
+    # 续费检查只调用 API，走独立的 I/O 线程池
+    _RENEW_IO_WORKERS = 8
+    # 续费等待签到时，为每个账户的签到预留的时长；超过按计划推算的截止时间后按当前积分继续
+    _CHECKIN_WAIT_SECONDS = 10 * 60
+
+    def __init__(
+        self,
+        store: DataStore,
+        ocr: LazyDdddOcr | None = None,
+        det: LazyDdddOcr | None = None,
+    ) -> None:
         self.store = store
+        self._store_lock = Lock()
+        # 常驻调度模式会传入已预热的模型，跨多次运行复用
+        self._ocr = ocr
+        self._det = det
+        # 签到与续费并行时，用于续费线程等待对应账户签到完成
+        self._checkin_events: dict[str, Event] = {}
+        # 续费等待签到的截止时间（monotonic）：排期确定后按账户计算，此前使用整体上限
+        self._checkin_deadlines: dict[str, float] = {}
+        self._checkin_wait_limit = 0.0
+        self._journal: RunJournal | None = None
+        self._concurrency: AdaptiveConcurrency | None = None
+        self._leases: AccountLeases | None = None
+
+    def _resolve_workers(self, settings: Any, total: int) -> int:
+        workers = getattr(settings, "checkin_workers", 1)
+        if not isinstance(workers, int) or workers < 1:
+            workers = 1
+        return max(1, min(workers, total))
 
     def _build_base_config(self, settings: Any) -> Config:
         base_config = Config.from_env(os.environ)
@@ -77,66 +132,414 @@ class MultiAccountRunner:
                 settings, "captcha_retry_unlimited", base_config.captcha_retry_unlimited
             ),
             captcha_save_samples=getattr(settings, "captcha_save_samples", base_config.captcha_save_samples),
+            captcha_fused_solver=getattr(settings, "captcha_fused_solver", base_config.captcha_fused_solver),
+            captcha_sift_weight=getattr(settings, "captcha_sift_weight", base_config.captcha_sift_weight),
+            captcha_template_weight=getattr(
+                settings, "captcha_template_weight", base_config.captcha_template_weight
+            ),
+            captcha_network_capture=getattr(
+                settings, "captcha_network_capture", base_config.captcha_network_capture
+            ),
+            captcha_service=getattr(settings, "captcha_service", base_config.captcha_service),
         )
 
-    def _create_session(self, settings: Any):
+    def _create_session(self, settings: Any, low_memory: bool = False):
         base_config = self._build_base_config(settings)
+        if low_memory and not base_config.chrome_low_memory:
+            logger.info("内存余量不足，自动启用 Chrome 低内存模式")
+            base_config = replace(base_config, chrome_low_memory=True)
         session = BrowserSession(base_config, debug=base_config.debug, linux=base_config.linux_mode)
         driver, wait, temp_dir = session.start()
-        ocr = LazyDdddOcr(det=False)
-        det = LazyDdddOcr(det=True)
+        ocr = self._ocr or LazyDdddOcr(det=False)
+        det = self._det or LazyDdddOcr(det=True)
         return base_config, session, driver, wait, temp_dir, ocr, det
 
     def _apply_random_delay(self, settings: Any) -> None:
         debug = getattr(settings, "debug", False)
-        max_delay = getattr(settings, "max_delay", 0)
         if debug:
             logger.info("调试模式已开启，跳过随机延时")
             return
-        if not isinstance(max_delay, int) or max_delay <= 0:
+        delay_sec = pick_delay_seconds(getattr(settings, "max_delay", 0))
+        if delay_sec <= 0:
             return
-        delay_min = random.randint(0, max_delay)
-        delay_sec = random.randint(0, 60)
-        logger.info("随机延时等待 %s 分钟 %s 秒", delay_min, delay_sec)
-        time.sleep(delay_min * 60 + delay_sec)
+        logger.info("随机延时等待 %s 分钟 %s 秒", delay_sec // 60, delay_sec % 60)
+        time.sleep(delay_sec)
 
     def _close_session(self, session: BrowserSession, temp_dir: str | None, base_config: Config) -> None:
         session.close()
         if temp_dir and not base_config.debug:
             shutil.rmtree(temp_dir, ignore_errors=True)
 
-    def run(self, delay: bool = False) -> list[AccountRunResult]:
+    def release_session(self, parts: tuple) -> None:
+        base_config, session, _, _, temp_dir, _, _ = parts
+        self._close_session(session, temp_dir, base_config)
+
+    def checkin_with_session(
+        self, account: Any, settings: Any, parts: tuple | None = None, low_memory: bool = False
+    ) -> tuple[AccountRunResult, tuple | None]:
+        """单账户签到入口：复用传入的浏览器会话，没有时新建；返回结果与会话，会话由调用方 release_session 释放。"""
+
+        try:
+            if parts is None:
+                parts = self._create_session(settings, low_memory=low_memory)
+            _, _, driver, wait, temp_dir, ocr, det = parts
+            result = self._run_single_account(
+                account=account,
+                settings=settings,
+                driver=driver,
+                wait=wait,
+                ocr=ocr,
+                det=det,
+                temp_dir=temp_dir,
+            )
+        except Exception as exc:
+            logger.error("用户 %s 签到失败: %s", self._account_label(account), exc)
+            result = self._mark_result(account, success=False, message=str(exc), status="failed")
+        return result, parts
+
+    def run(self, delay: bool = False, resume: bool | None = False) -> list[AccountRunResult]:
+        """执行签到；resume=None 时按 checkin_resume 设置续跑（仅定时任务使用），面板手动签到不跳过账户。"""
         data = self.store.load() if self.store.data is None else self.store.data
+        with self._leasing(data.settings):
+            return self._run_checkin(data, delay, resume)
+
+    def _run_checkin(self, data: Any, delay: bool, resume: bool | None) -> list[AccountRunResult]:
         if not data.accounts:
             logger.info("未配置任何账户，跳过多账户调度")
             return []
-        if not any(getattr(account, "enabled", False) for account in data.accounts):
+        accounts = [account for account in data.accounts if getattr(account, "enabled", False)]
+        if not accounts:
             logger.info("没有启用的账户，跳过多账户调度")
             return []
-        if delay:
-            self._apply_random_delay(data.settings)
+        if resume is None:
+            resume = getattr(data.settings, "checkin_resume", True)
 
-        base_config, session, driver, wait, temp_dir, ocr, det = self._create_session(data.settings)
+        journal = RunJournal()
+        journal.prune()
+        self._journal = journal
+        results: list[AccountRunResult | None] = [None] * len(accounts)
+        pending: list[tuple[int, Any]] = []
+        completed = journal.completed_today() if resume else set()
+        for index, account in enumerate(accounts):
+            key = self._account_key(account)
+            if resume and (key in completed or checked_in_today(account)):
+                # 续跑：今日已成功的账户不启动浏览器，直接记为已签到
+                logger.info("用户 %s 今日已签到成功，续跑模式跳过", self._account_label(account))
+                journal.record(key, PHASE_SKIP, "already_signed")
+                results[index] = self._build_result(
+                    account, success=True, status="already_signed", message="resumed"
+                )
+                self._signal_checkin_done(account)
+                continue
+            pending.append((index, account))
+        if not pending:
+            logger.info("所有启用账户今日均已签到，跳过浏览器流程")
+            return [item for item in results if item is not None]
+
+        pending = self._prioritize(pending, data.settings)
+        debug = getattr(data.settings, "debug", False)
+        if delay and debug:
+            logger.info("调试模式已开启，跳过随机延时")
+        # 每个账户独立随机启动时间，工作线程只睡到下一个到期账户；优先级高的账户分到更早的时间
+        schedule = build_start_schedule(
+            pending,
+            max_delay=getattr(data.settings, "max_delay", 0),
+            debug=debug,
+            delay=delay,
+            labels=[self._account_label(account) for _, account in pending],
+            ordered=True,
+        )
+
+        workers = self._resolve_workers(data.settings, len(pending))
+        self._record_checkin_deadlines(schedule, workers)
+        self._concurrency = None
+        if getattr(data.settings, "adaptive_concurrency", False):
+            # 并发数作为上限，实际名额按内存/CPU 余量动态调整
+            self._concurrency = AdaptiveConcurrency(max_slots=workers)
+        errors: list[Exception] = []
+        if workers == 1:
+            self._drain_accounts(schedule, data.settings, results)
+        else:
+            logger.info("启用 %s 个浏览器并发签到，共 %s 个账户", workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="checkin") as pool:
+                futures = [
+                    pool.submit(self._drain_accounts, schedule, data.settings, results)
+                    for _ in range(workers)
+                ]
+                for future in futures:
+                    exc = future.exception()
+                    if exc is not None:
+                        logger.error("签到工作线程异常退出: %s", exc)
+                        errors.append(exc)
+        if errors and any(item is None for item in results):
+            # 所有浏览器均无法启动时与串行模式保持一致：向上抛出
+            raise errors[0]
+        return [item for item in results if item is not None]
+
+    def _record_checkin_deadlines(self, schedule: StartSchedule, workers: int) -> None:
+        """按排期推算每个账户签到完成的最晚时间：计划开始时间 + 同一工作线程上排在它之前的签到耗时。"""
+
+        if not self._checkin_events:
+            return
+        for rank, (due_at, _, (_, account)) in enumerate(schedule.entries()):
+            rounds = rank // workers + 1
+            self._checkin_deadlines[self._account_key(account)] = due_at + self._CHECKIN_WAIT_SECONDS * rounds
+
+    def _prioritize(self, entries: list[tuple[int, Any]], settings: Any) -> list[tuple[int, Any]]:
+        """按到期紧迫度/积分缺口/上次失败排序，临近到期的账户排在最前。"""
+
+        urgent_days = getattr(settings, "renew_threshold_days", 7)
+        order = order_by_priority([account for _, account in entries], urgent_days)
+        ordered = [entries[position] for position in order]
+        for _, account in ordered:
+            remaining = days_remaining(account)
+            if remaining is None or remaining > urgent_days:
+                break
+            logger.info("用户 %s 服务器 %.1f 天后到期，优先处理", self._account_label(account), remaining)
+        return ordered
+
+    def _drain_accounts(
+        self,
+        schedule: StartSchedule,
+        settings: Any,
+        results: list[AccountRunResult | None],
+    ) -> None:
+        """单个工作线程：按到期顺序取账户，浏览器在首个账户到期时才启动。
 
-        results: list[AccountRunResult] = []
+        进程池模式下每个线程独占一个常驻工作进程，浏览器与验证码识别都在该进程内执行。
+        """
+
+        parts = None
+        worker = self._create_worker(settings)
         try:
-            for account in data.accounts:
-                if not account.enabled:
+            while True:
+                entry = schedule.pop()
+                if entry is None:
+                    return
+                due_at, order, (index, account) = entry
+                wait_sec = seconds_until(due_at)
+                if parts is not None and wait_sec > self._IDLE_CLOSE_SECONDS:
+                    logger.info("下一个账户 %.0f 秒后开始，先关闭浏览器释放内存", wait_sec)
+                    self.release_session(parts)
+                    parts = None
+                if worker is not None and wait_sec > self._IDLE_CLOSE_SECONDS:
+                    worker.release_browser()
+                sleep_until(due_at)
+                key = self._account_key(account)
+                if not self._claim_checkin(account):
+                    self._signal_checkin_done(account)
                     continue
-                results.append(
-                    self._run_single_account(
-                        account=account,
-                        settings=data.settings,
-                        driver=driver,
-                        wait=wait,
-                        ocr=ocr,
-                        det=det,
-                        temp_dir=temp_dir,
-                    )
-                )
+                precheck = self._precheck_account(account, settings)
+                if precheck is not None:
+                    results[index] = precheck
+                    if self._journal:
+                        self._journal.record(key, PHASE_CHECKIN, "success", precheck.status)
+                    self._signal_checkin_done(account)
+                    continue
+                slots = self._concurrency
+                if slots is not None and not slots.try_acquire():
+                    # 资源余量不足：先释放本线程空闲的浏览器，再等待名额
+                    if parts is not None:
+                        self.release_session(parts)
+                        parts = None
+                    if worker is not None:
+                        worker.release_browser()
+                    slots.acquire()
+                try:
+                    low_memory = slots is not None and slots.low_memory()
+                    if worker is None and parts is None:
+                        try:
+                            parts = self._create_session(settings, low_memory=low_memory)
+                        except Exception:
+                            # 放回队列，交给其他仍可用的工作线程
+                            schedule.push(due_at, order, (index, account))
+                            raise
+                    if self._journal:
+                        self._journal.record(key, PHASE_START, "running")
+                    try:
+                        if worker is not None:
+                            result = self._run_in_worker(worker, account, settings, low_memory=low_memory)
+                        else:
+                            _, _, driver, wait, temp_dir, ocr, det = parts
+                            result = self._run_single_account(
+                                account=account,
+                                settings=settings,
+                                driver=driver,
+                                wait=wait,
+                                ocr=ocr,
+                                det=det,
+                                temp_dir=temp_dir,
+                            )
+                        results[index] = result
+                        if self._journal:
+                            outcome = "success" if result.success else "failed"
+                            self._journal.record(key, PHASE_CHECKIN, outcome, result.status)
+                    finally:
+                        self._signal_checkin_done(account)
+                    if slots is not None:
+                        slots.observe_session(self._session_rss_mb(parts, worker))
+                finally:
+                    if slots is not None:
+                        slots.release()
         finally:
-            self._close_session(session, temp_dir, base_config)
-        return results
+            if parts is not None:
+                self.release_session(parts)
+            if worker is not None:
+                worker.close()
+
+    def _session_rss_mb(self, parts: tuple | None, worker: AccountWorker | None) -> float:
+        """单个并发名额的实测内存：浏览器进程树，进程池模式下为整个工作进程树。"""
+
+        if worker is not None:
+            pid = worker.pid
+        elif parts is not None:
+            pid = parts[1].service_pid()
+        else:
+            pid = None
+        return process_tree_rss_mb(pid) if pid else 0.0
+
+    def _create_worker(self, settings: Any) -> AccountWorker | None:
+        if not getattr(settings, "checkin_process_pool", False):
+            return None
+        rss_limit = getattr(settings, "worker_rss_limit_mb", 0)
+        if not isinstance(rss_limit, int) or rss_limit < 0:
+            rss_limit = 0
+        return AccountWorker(rss_limit_mb=rss_limit)
+
+    def _run_in_worker(
+        self, worker: AccountWorker, account: Any, settings: Any, low_memory: bool = False
+    ) -> AccountRunResult:
+        """在工作进程中执行签到，父进程负责回写账户状态。"""
+
+        try:
+            reply = worker.run_account(account, settings, low_memory=low_memory)
+        except WorkerCrashed as exc:
+            logger.error("用户 %s 签到工作进程崩溃: %s", self._account_label(account), exc)
+            return self._mark_result(account, success=False, message="worker_crashed", status="failed")
+        account.last_checkin = reply.last_checkin
+        account.last_status = reply.last_status
+        self._persist_account(account, "last_checkin", "last_status")
+        return reply.result
+
+    def _precheck_account(self, account: Any, settings: Any) -> AccountRunResult | None:
+        """HTTP 预检：确认今日已签到则直接返回结果，否则返回 None 交给浏览器流程。"""
+
+        if not getattr(settings, "checkin_precheck", False):
+            return None
+        config = Config.from_account(account, settings)
+        label = self._account_label(account)
+        try:
+            probe = probe_daily_reward(config, getattr(settings, "checkin_task_id", 0))
+        except Exception as exc:
+            logger.warning("用户 %s 签到状态预检异常，回退浏览器流程: %s", label, exc)
+            return None
+        if not probe.signed:
+            logger.info("用户 %s 签到状态预检: %s %s，启动浏览器签到", label, probe.status, probe.reason)
+            return None
+        logger.info("用户 %s 今日已签到（HTTP 预检确认），跳过浏览器流程", label)
+        return self._mark_result(
+            account,
+            success=True,
+            message="success",
+            status="already_signed",
+            current_points=probe.points,
+            earned_points=0 if probe.points is not None else None,
+        )
+
+    def _account_key(self, account: Any) -> str:
+        return str(getattr(account, "id", "") or getattr(account, "username", "") or "")
+
+    def _signal_checkin_done(self, account: Any) -> None:
+        event = self._checkin_events.get(self._account_key(account))
+        if event is not None:
+            event.set()
+
+    def run_with_renew(self, delay: bool = False) -> tuple[list[AccountRunResult], list[AccountRenewResult]]:
+        """签到与续费检查并行执行。
+
+        续费检查只依赖 API，在独立 I/O 线程池中与浏览器签到同时进行；
+        某账户积分不足以续费时，先等待该账户签到完成再重新读取积分。
+        """
+        data = self.store.load() if self.store.data is None else self.store.data
+        self._checkin_events = {
+            self._account_key(account): Event() for account in data.accounts if account.enabled
+        }
+        # 排期确定前的整体上限：最大随机延时 + 所有账户依次签到的预留时长
+        max_delay = getattr(data.settings, "max_delay", 0)
+        max_delay = max_delay if isinstance(max_delay, int) and delay else 0
+        self._checkin_wait_limit = (
+            time.monotonic() + max(0, max_delay) * 60 + self._CHECKIN_WAIT_SECONDS * len(self._checkin_events)
+        )
+        renew_outcome: dict[str, Any] = {}
+
+        def renew() -> None:
+            try:
+                renew_outcome["results"] = self.run_renew()
+            except Exception as exc:
+                renew_outcome["error"] = exc
+
+        try:
+            with self._leasing(data.settings):
+                renew_thread = Thread(target=renew, name="renew", daemon=True)
+                renew_thread.start()
+                try:
+                    results = self.run(delay=delay, resume=None)
+                finally:
+                    # 签到结束（含异常）后释放所有仍在等待的续费检查
+                    for event in self._checkin_events.values():
+                        event.set()
+                    renew_thread.join()
+        finally:
+            self._checkin_events = {}
+            self._checkin_deadlines = {}
+        if "error" in renew_outcome:
+            raise renew_outcome["error"]
+        return results, renew_outcome["results"]
+
+    @contextmanager
+    def _leasing(self, settings: Any) -> Iterator[None]:
+        """租约模式：多节点共享 data 卷时按账户分摊；嵌套调用复用外层租约。"""
+
+        if self._leases is not None or not getattr(settings, "account_leasing", False):
+            yield
+            return
+        self._leases = AccountLeases()
+        self._leases.start_heartbeat()
+        logger.info("账户租约模式已启用，节点: %s", self._leases.node_id)
+        try:
+            yield
+        finally:
+            self._leases.close()
+            self._leases = None
+
+    def _claim_checkin(self, account: Any) -> bool:
+        """租约模式下领取账户签到；由其他节点处理或今日已被其他节点签到完成时返回 False。"""
+
+        if self._leases is None:
+            return True
+        key = self._account_key(account)
+        if not self._leases.try_acquire(key):
+            logger.info("用户 %s 已由其他节点处理，跳过", self._account_label(account))
+            return False
+        if self._journal and key in self._journal.completed_today():
+            logger.info("用户 %s 今日已由其他节点签到完成，跳过", self._account_label(account))
+            return False
+        return True
+
+    def _claim_renewal(self, account: Any) -> bool:
+        """领取账户续费检查；租约被其他节点持有时返回 False，由持有租约的节点汇报结果。"""
+
+        key = self._account_key(account)
+        if self._leases is not None and not self._leases.try_acquire(f"renew-{key}"):
+            logger.info("用户 %s 续费检查已由其他节点处理，跳过", self._account_label(account))
+            return False
+        return True
+
+    def _account_label(self, account: Any) -> str:
+        account_id = str(getattr(account, "id", "") or "").strip()
+        account_name = str(getattr(account, "name", "") or "").strip()
+        account_username = str(getattr(account, "username", "") or "").strip()
+        return account_name or account_username or account_id or "unknown"
 
     def run_for_account(self, account_id: str, delay: bool = False) -> AccountRunResult | None:
         data = self.store.load() if self.store.data is None else self.store.data
@@ -167,63 +570,141 @@ class MultiAccountRunner:
         if not data.accounts:
             logger.info("未配置任何账户，跳过续费检查")
             return []
-        results: list[AccountRenewResult] = []
-        for account in data.accounts:
-            if not account.enabled:
-                continue
-            account_id = str(getattr(account, "id", "") or "").strip()
-            account_name = str(getattr(account, "name", "") or "").strip()
-            account_username = str(getattr(account, "username", "") or "").strip()
-            account_name = account_name or account_username or account_id
-            if not getattr(account, "api_key", ""):
-                results.append(
-                    AccountRenewResult(
-                        account_id=account_id,
-                        account_name=account_name,
-                        has_api_key=False,
-                        whitelist_ids=[],
-                        server_names=[],
-                        success=False,
-                        message="no_api_key",
-                    )
-                )
+        accounts = [account for account in data.accounts if account.enabled]
+        if not accounts:
+            return []
+        with self._leasing(data.settings):
+            return self._run_renew_accounts(accounts, data.settings)
+
+    def _run_renew_accounts(self, accounts: list[Any], settings: Any) -> list[AccountRenewResult]:
+        # 按优先级提交，结果仍按账户原有顺序返回
+        ordered = self._prioritize(list(enumerate(accounts)), settings)
+        results: list[AccountRenewResult | None] = [None] * len(accounts)
+        workers = max(1, min(self._RENEW_IO_WORKERS, len(accounts)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="renew-io") as pool:
+            futures = [
+                (index, pool.submit(self._renew_single_account, account, settings))
+                for index, account in ordered
+            ]
+            for index, future in futures:
+                results[index] = future.result()
+        return [item for item in results if item is not None]
+
+    def _renew_single_account(self, account: Any, settings: Any) -> AccountRenewResult | None:
+        account_id = str(getattr(account, "id", "") or "").strip()
+        account_name = str(getattr(account, "name", "") or "").strip()
+        account_username = str(getattr(account, "username", "") or "").strip()
+        account_name = account_name or account_username or account_id
+        if not getattr(account, "api_key", ""):
+            return AccountRenewResult(
+                account_id=account_id,
+                account_name=account_name,
+                has_api_key=False,
+                whitelist_ids=[],
+                server_names=[],
+                success=False,
+                message="no_api_key",
+            )
+        key = self._account_key(account)
+        journal = self._journal or RunJournal()
+        if not self._claim_renewal(account):
+            return None
+        # 续费完成记录写在共享 data 卷的运行日志中，其他节点或当天后续运行也能看到，
+        # 避免同一台服务器被重复扣积分续费；仍返回结果，保证通知中的续费汇总完整
+        if key in journal.renewed_today():
+            logger.info("用户 %s 今日已完成续费，跳过续费检查", account_name)
+            return AccountRenewResult(
+                account_id=account_id,
+                account_name=account_name,
+                has_api_key=True,
+                whitelist_ids=[],
+                server_names=[],
+                success=True,
+                message="今日已完成续费，跳过续费检查",
+            )
+        try:
+            config = Config.from_account(account, settings)
+            manager = ServerManager(
+                account.api_key,
+                config=config,
+                refresh_points=self._build_points_waiter(account),
+            )
+            result = manager.check_and_renew()
+            renewed = result.get("renewed") or []
+            journal.record(
+                key,
+                PHASE_RENEW,
+                RENEW_OUTCOME_RENEWED if renewed else RENEW_OUTCOME_CHECKED,
+                ",".join(renewed),
+            )
+            self._record_renew_priority(account, result)
+            report = manager.generate_report(result)
+            server_names = [
+                item.get("name", "") for item in result.get("servers", []) if item.get("name")
+            ]
+            whitelist_ids = list(config.renew_product_ids)
+            return AccountRenewResult(
+                account_id=account_id,
+                account_name=account_name,
+                has_api_key=True,
+                whitelist_ids=whitelist_ids,
+                server_names=server_names,
+                success=True,
+                message="ok",
+                report=report,
+            )
+        except Exception as exc:
+            user_label = account_name or account_username or account_id or "unknown"
+            logger.error("用户 %s 续费检查失败: %s", user_label, exc)
+            return AccountRenewResult(
+                account_id=account_id,
+                account_name=account_name,
+                has_api_key=True,
+                whitelist_ids=[],
+                server_names=[],
+                success=False,
+                message=str(exc),
+            )
+
+    def _record_renew_priority(self, account: Any, result: dict) -> None:
+        """回写最早到期时间与积分缺口，供下次运行排序；未读取到服务器（如 API 失败）时保留上次的记录。"""
+
+        if not result.get("servers"):
+            return
+        expiries = []
+        for server in result.get("servers", []):
+            expired_at = server.get("expired_at")
+            if not isinstance(expired_at, int):
                 continue
-            try:
-                config = Config.from_account(account, data.settings)
-                manager = ServerManager(account.api_key, config=config)
-                result = manager.check_and_renew()
-                report = manager.generate_report(result)
-                server_names = [
-                    item.get("name", "") for item in result.get("servers", []) if item.get("name")
-                ]
-                whitelist_ids = list(config.renew_product_ids)
-                results.append(
-                    AccountRenewResult(
-                        account_id=account_id,
-                        account_name=account_name,
-                        has_api_key=True,
-                        whitelist_ids=whitelist_ids,
-                        server_names=server_names,
-                        success=True,
-                        message="ok",
-                        report=report,
-                    )
-                )
-            except Exception as exc:
-                user_label = account_name or account_username or account_id or "unknown"
-                logger.error("用户 %s 续费检查失败: %s", user_label, exc)
-                results.append(
-                    AccountRenewResult(
-                        account_id=account_id,
-                        account_name=account_name,
-                        has_api_key=True,
-                        whitelist_ids=[],
-                        server_names=[],
-                        success=False,
-                        message=str(exc),
-                    )
-                )
-        return results
+            if server.get("renewed"):
+                expired_at += int(server.get("renewed_days") or 0) * 86400
+            expiries.append(expired_at)
+        warning = result.get("points_warning") or {}
+        account.next_expiry = min(expiries) if expiries else 0
+        account.points_shortage = int(warning.get("shortage", 0) or 0)
+        self._persist_account(account, "next_expiry", "points_shortage")
+
+    def _build_points_waiter(self, account: Any):
+        event = self._checkin_events.get(self._account_key(account))
+        if event is None:
+            return None
+        key = self._account_key(account)
+        user_label = self._account_label(account)
+
+        def wait_checkin() -> None:
+            if event.is_set():
+                return
+            logger.info("用户 %s 积分不足以续费，等待签到完成后重新读取积分", user_label)
+            while not event.is_set():
+                # 截止时间在排期确定后才精确到账户，因此分段等待并每次重新读取
+                deadline = self._checkin_deadlines.get(key, self._checkin_wait_limit)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("用户 %s 等待签到超时，按当前积分继续续费检查", user_label)
+                    return
+                event.wait(min(remaining, 30))
+
+        return wait_checkin
 
     def _run_single_account(
         self,
@@ -250,6 +731,7 @@ class MultiAccountRunner:
             temp_dir=temp_dir,
             api=api_client,
             config=config,
+            network=attach_network_capture(driver, config),
         )
 
         try:
@@ -303,15 +785,43 @@ class MultiAccountRunner:
         now = datetime.now().isoformat()
         account.last_checkin = now
         account.last_status = "success" if success else message or "failed"
+        self._persist_account(account, "last_checkin", "last_status")
+        return self._build_result(
+            account,
+            success=success,
+            status=status,
+            message=message,
+            current_points=current_points,
+            earned_points=earned_points,
+        )
+
+    def _persist_account(self, account: Any, *fields: str) -> None:
+        """回写账户字段；租约模式下只合并本次修改的字段，避免覆盖其他节点的写入。"""
+
+        try:
+            with self._store_lock:
+                if self._leases is not None:
+                    self.store.update_account_fields(
+                        account.id, {name: getattr(account, name) for name in fields}
+                    )
+                else:
+                    self.store.update_account(account)
+        except Exception as exc:
+            logger.error("用户 %s 回写账户状态失败: %s", self._account_label(account), exc)
+
+    def _build_result(
+        self,
+        account: Any,
+        success: bool,
+        status: str,
+        message: str,
+        current_points: int | None = None,
+        earned_points: int | None = None,
+    ) -> AccountRunResult:
         account_id = str(getattr(account, "id", "") or "").strip()
         account_name = str(getattr(account, "name", "") or "").strip()
         account_username = str(getattr(account, "username", "") or "").strip()
         account_name = account_name or account_username or account_id
-        user_label = account_name or account_username or account_id or "unknown"
-        try:
-            self.store.update_account(account)
-        except Exception as exc:
-            logger.error("用户 %s 回写账户状态失败: %s", user_label, exc)
         return AccountRunResult(
             account_id=account_id,
             account_name=account_name,
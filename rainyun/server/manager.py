@@ -4,13 +4,16 @@
 """
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
 from rainyun.api.client import RainyunAPI, RainyunAPIError
 from rainyun.config import Config, get_default_config
 
 logger = logging.getLogger(__name__)
 
+# 每次积分续费的天数
+RENEW_DURATION_DAYS = 7
+
 
 class ServerInfo:
     """服务器信息"""
@@ -41,15 +44,22 @@ class ServerInfo:
 class ServerManager:
     """服务器管理器"""
 
-    def __init__(self, api_key: str, config: Optional[Config] = None):
+    def __init__(
+        self,
+        api_key: str,
+        config: Optional[Config] = None,
+        refresh_points: Optional[Callable[[], None]] = None,
+    ):
         """
         初始化服务器管理器
 
         Args:
             api_key: 雨云 API 密钥
+            refresh_points: 积分不足时调用一次（如等待同账户签到完成），随后重新读取积分
         """
         self.config = config or get_default_config()
         self.api = RainyunAPI(api_key, config=self.config)
+        self._refresh_points = refresh_points
         self.auto_renew = self.config.auto_renew
         self.renew_threshold = self.config.renew_threshold_days
         self.renew_product_ids = self.config.renew_product_ids
@@ -159,12 +169,15 @@ class ServerManager:
         if not self.auto_renew:
             return f"{server.name} 即将到期，但自动续费已关闭"
 
+        if result["points"] < server.renew_price:
+            self._reload_points(result)
         if result["points"] >= server.renew_price:
             try:
-                self.api.renew_server(server.id, days=7)
+                self.api.renew_server(server.id, days=RENEW_DURATION_DAYS)
                 logger.info(f"{self._user_prefix}✅ {server.name} 续费成功！消耗 {server.renew_price} 积分")
                 result["points"] -= server.renew_price
                 status["renewed"] = True
+                status["renewed_days"] = RENEW_DURATION_DAYS
                 result["renewed"].append(server.name)
                 return None
             except RainyunAPIError as e:
@@ -174,6 +187,21 @@ class ServerManager:
         logger.warning(f"{self._user_prefix}{warning}")
         return warning
 
+    def _reload_points(self, result: dict) -> None:
+        """积分不足时等待外部积分变动（签到）完成并重新读取，仅执行一次。"""
+        if self._refresh_points is None:
+            return
+        refresh, self._refresh_points = self._refresh_points, None
+        try:
+            refresh()
+            points = self.api.get_user_points()
+        except Exception as e:
+            logger.warning(f"{self._user_prefix}重新读取积分失败: {e}")
+            return
+        if points != result["points"]:
+            logger.info(f"{self._user_prefix}签到后积分更新: {result['points']} -> {points}")
+        result["points"] = points
+
     def check_and_renew(self) -> dict:
         """
         检查所有服务器到期时间，必要时自动续费
@@ -208,9 +236,11 @@ class ServerManager:
                     "id": server.id,
                     "name": server.name,
                     "expired": server.expired_str,
+                    "expired_at": server.expired_at,
                     "days_remaining": server.days_remaining,
                     "renew_price": server.renew_price,
                     "renewed": False,
+                    "renewed_days": 0,
                 }
 
                 if server.days_remaining <= self.renew_threshold:
@@ -1,13 +1,14 @@
 """Utility helpers for Rainyun."""
 
 from .http import download_bytes, download_to_file, post_with_retry, request_with_retry
-from .image import decode_image_bytes, encode_image_bytes, normalize_gray, split_sprite_image
+from .image import crop_boxes, decode_image_bytes, encode_image_bytes, normalize_gray, split_sprite_image
 
 __all__ = [
     "download_bytes",
     "download_to_file",
     "post_with_retry",
     "request_with_retry",
+    "crop_boxes",
     "decode_image_bytes",
     "encode_image_bytes",
     "normalize_gray",
@@ -3,14 +3,39 @@
 import logging
 import os
 import time
+from threading import Lock
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from rainyun.config import Config
 
 logger = logging.getLogger(__name__)
 
+# 进程内共享的连接池：各会话 cookie 互相隔离，TCP/TLS 连接可复用
+_POOL_MAXSIZE = 16
+_shared_adapter: HTTPAdapter | None = None
+_shared_adapter_lock = Lock()
+
+
+def _get_shared_adapter() -> HTTPAdapter:
+    global _shared_adapter
+    if _shared_adapter is None:
+        with _shared_adapter_lock:
+            if _shared_adapter is None:
+                _shared_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE)
+    return _shared_adapter
+
+
+def build_pooled_session() -> requests.Session:
+    """创建挂载共享连接池的 Session（cookie 独立，连接复用）。"""
+    session = requests.Session()
+    adapter = _get_shared_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 def request_with_retry(
     method: str,
@@ -59,12 +84,14 @@ def download_bytes(
     max_retries: int = 3,
     retry_delay: float = 2,
     log: logging.Logger | None = None,
+    session: requests.Session | None = None,
 ) -> bytes:
     last_error: str | None = None
     log = log or logger
+    getter = session.get if session is not None else requests.get
     for attempt in range(1, max_retries + 1):
         try:
-            response = requests.get(url, timeout=timeout)
+            response = getter(url, timeout=timeout)
             if response.status_code == 200 and response.content:
                 return response.content
             last_error = f"status_code={response.status_code}"
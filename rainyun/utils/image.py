@@ -45,3 +45,23 @@ def normalize_gray(image: np.ndarray) -> np.ndarray:
     if len(image.shape) == 2:
         return image
     return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def crop_boxes(
+    image: np.ndarray,
+    bboxes: list[tuple[int, int, int, int]],
+) -> list[tuple[tuple[int, int], np.ndarray]]:
+    """按检测框裁剪，返回 [(中心点, 裁剪图)]，跳过无效框。"""
+    crops: list[tuple[tuple[int, int], np.ndarray]] = []
+    for bbox in bboxes:
+        if len(bbox) != 4:
+            continue
+        x1, y1, x2, y2 = map(int, bbox)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        crop = image[y1:y2, x1:x2]
+        if crop.size == 0:
+            continue
+        center = (int((x1 + x2) / 2), int((y1 + y2) / 2))
+        crops.append((center, crop))
+    return crops
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request, Response
@@ -10,6 +12,10 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 
+from rainyun.captcha.models import warm_up_models_in_background
+from rainyun.captcha.service import start_service_in_background, stop_service
+from rainyun.scheduler.daemon import is_daemon_mode, start_daemon, stop_daemon
+from rainyun.web.deps import get_store
 from rainyun.web.errors import ApiError
 from rainyun.web.logs import init_log_buffer
 from rainyun.web.responses import error_response
@@ -25,9 +31,40 @@ from rainyun.web.routes import (
 logger = logging.getLogger(__name__)
 
 
+def _captcha_service_enabled() -> bool:
+    try:
+        return bool(get_store().get_settings().captcha_service)
+    except Exception as exc:
+        logger.warning("读取验证码识别服务设置失败: %s", exc)
+        return False
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # 常驻调度模式：定时任务跑在 Web 进程内，复用已加载的依赖与模型
+    daemon_enabled = is_daemon_mode()
+    service_started = False
+    if daemon_enabled:
+        logger.info("常驻调度模式已启用")
+        start_daemon()
+    elif _captcha_service_enabled():
+        # cron 模式下每次签到都是新进程，由 Web 进程承载识别服务并预热模型
+        service_started = start_service_in_background(warm_up=True) is not None
+    elif os.environ.get("MODEL_WARMUP", "false").strip().lower() == "true":
+        # 手动签到同样在 Web 进程内执行，预热后首次识别无需再加载模型
+        warm_up_models_in_background()
+    try:
+        yield
+    finally:
+        if daemon_enabled:
+            stop_daemon()
+        if service_started:
+            stop_service()
+
+
 def create_app() -> FastAPI:
     init_log_buffer()
-    app = FastAPI(title="Rainyun Web API")
+    app = FastAPI(title="Rainyun Web API", lifespan=_lifespan)
 
     @app.exception_handler(ApiError)
     async def api_error_handler(request: Request, exc: ApiError) -> JSONResponse:
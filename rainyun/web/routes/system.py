@@ -6,11 +6,15 @@ from typing import Mapping
 
 from fastapi import APIRouter, Body, Depends
 
+from rainyun.captcha.batching import get_inference_batcher
+from rainyun.captcha.metrics import named_latency_snapshot
+from rainyun.captcha.models import get_model_registry
 from rainyun.data.models import Settings
 from rainyun.data.store import DataStore
 from rainyun.notify import send
 from rainyun.notify.registry import DEFAULT_REGISTRY
 from rainyun.scheduler.cron import normalize_schedule, write_cron_file
+from rainyun.scheduler.daemon import get_daemon, is_daemon_mode
 from rainyun.web.deps import get_store, require_auth
 from rainyun.web.errors import ApiError
 from rainyun.web.responses import success_response
@@ -53,7 +57,11 @@ def update_settings(
     settings = Settings.from_dict(merged_payload)
     settings.cron_schedule = normalize_schedule(settings.cron_schedule)
     store.update_settings(settings)
-    if os.environ.get("CRON_MODE", "false").strip().lower() == "true":
+    if is_daemon_mode():
+        daemon = get_daemon()
+        if daemon:
+            daemon.reschedule()
+    elif os.environ.get("CRON_MODE", "false").strip().lower() == "true":
         try:
             write_cron_file(settings.cron_schedule)
         except Exception as exc:
@@ -61,6 +69,21 @@ def update_settings(
     return success_response(settings.to_dict())
 
 
+@router.get("/models")
+def get_model_metrics() -> dict:
+    """OCR/DET 模型池状态与加载/推理耗时（仅统计 Web 进程内的识别）。"""
+    metrics = get_model_registry().metrics()
+    batcher = get_inference_batcher()
+    metrics["batching"] = batcher.metrics() if batcher else None
+    return success_response(metrics)
+
+
+@router.get("/captcha/timings")
+def get_captcha_timings() -> dict:
+    """验证码组件刷新/提交的实际响应耗时分布，以及各名次候选答案的提交结果。"""
+    return success_response(named_latency_snapshot())
+
+
 @router.post("/notify/test")
 def test_notify(payload: dict = Body(default_factory=dict), store: DataStore = Depends(get_store)) -> dict:
     channel_id = payload.get("channel_id")
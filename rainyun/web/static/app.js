@@ -45,6 +45,14 @@ const cronNext = document.getElementById("cron-next");
 const settingTimeout = document.getElementById("setting-timeout");
 const settingMaxDelay = document.getElementById("setting-max-delay");
 const settingDebug = document.getElementById("setting-debug");
+const settingCheckinWorkers = document.getElementById("setting-checkin-workers");
+const settingCheckinResume = document.getElementById("setting-checkin-resume");
+const settingCheckinPrecheck = document.getElementById("setting-checkin-precheck");
+const settingCheckinTaskId = document.getElementById("setting-checkin-task-id");
+const settingCheckinProcessPool = document.getElementById("setting-checkin-process-pool");
+const settingAdaptiveConcurrency = document.getElementById("setting-adaptive-concurrency");
+const settingWorkerRssLimit = document.getElementById("setting-worker-rss-limit");
+const settingAccountLeasing = document.getElementById("setting-account-leasing");
 const settingRequestTimeout = document.getElementById("setting-request-timeout");
 const settingMaxRetries = document.getElementById("setting-max-retries");
 const settingRetryDelay = document.getElementById("setting-retry-delay");
@@ -54,6 +62,11 @@ const settingDownloadRetryDelay = document.getElementById("setting-download-retr
 const settingCaptchaRetryLimit = document.getElementById("setting-captcha-retry-limit");
 const settingCaptchaRetryUnlimited = document.getElementById("setting-captcha-retry-unlimited");
 const settingCaptchaSaveSamples = document.getElementById("setting-captcha-save-samples");
+const settingCaptchaFusedSolver = document.getElementById("setting-captcha-fused-solver");
+const settingCaptchaNetworkCapture = document.getElementById("setting-captcha-network-capture");
+const settingCaptchaService = document.getElementById("setting-captcha-service");
+const settingCaptchaSiftWeight = document.getElementById("setting-captcha-sift-weight");
+const settingCaptchaTemplateWeight = document.getElementById("setting-captcha-template-weight");
 const settingSkipPushTitle = document.getElementById("setting-skip-push-title");
 const saveSettingsBtn = document.getElementById("save-settings");
 
@@ -1591,6 +1604,14 @@ async function loadSettings() {
   settingTimeout.value = settings.timeout ?? 15;
   settingMaxDelay.value = settings.max_delay ?? 90;
   settingDebug.checked = !!settings.debug;
+  settingCheckinWorkers.value = settings.checkin_workers ?? 1;
+  settingCheckinResume.checked = settings.checkin_resume !== false;
+  settingCheckinPrecheck.checked = !!settings.checkin_precheck;
+  settingCheckinTaskId.value = settings.checkin_task_id ?? 0;
+  settingCheckinProcessPool.checked = !!settings.checkin_process_pool;
+  settingAdaptiveConcurrency.checked = !!settings.adaptive_concurrency;
+  settingWorkerRssLimit.value = settings.worker_rss_limit_mb ?? 1024;
+  settingAccountLeasing.checked = !!settings.account_leasing;
   settingRequestTimeout.value = settings.request_timeout ?? 15;
   settingMaxRetries.value = settings.max_retries ?? 3;
   settingRetryDelay.value = settings.retry_delay ?? 2;
@@ -1600,6 +1621,11 @@ async function loadSettings() {
   settingCaptchaRetryLimit.value = settings.captcha_retry_limit ?? 5;
   settingCaptchaRetryUnlimited.checked = !!settings.captcha_retry_unlimited;
   settingCaptchaSaveSamples.checked = !!settings.captcha_save_samples;
+  settingCaptchaFusedSolver.checked = !!settings.captcha_fused_solver;
+  settingCaptchaNetworkCapture.checked = !!settings.captcha_network_capture;
+  settingCaptchaService.checked = !!settings.captcha_service;
+  settingCaptchaSiftWeight.value = settings.captcha_sift_weight ?? 0.5;
+  settingCaptchaTemplateWeight.value = settings.captcha_template_weight ?? 0.5;
   settingSkipPushTitle.value = settings.skip_push_title || "";
   notifyChannels = normalizeNotifyChannels(settings);
   renderNotifyList();
@@ -1882,6 +1908,14 @@ async function saveSettings() {
     timeout: readNumberValue(settingTimeout, 15),
     max_delay: readNumberValue(settingMaxDelay, 90),
     debug: settingDebug.checked,
+    checkin_workers: readNumberValue(settingCheckinWorkers, 1),
+    checkin_resume: settingCheckinResume.checked,
+    checkin_precheck: settingCheckinPrecheck.checked,
+    checkin_task_id: readNumberValue(settingCheckinTaskId, 0),
+    checkin_process_pool: settingCheckinProcessPool.checked,
+    adaptive_concurrency: settingAdaptiveConcurrency.checked,
+    worker_rss_limit_mb: readNumberValue(settingWorkerRssLimit, 1024),
+    account_leasing: settingAccountLeasing.checked,
     request_timeout: readNumberValue(settingRequestTimeout, 15),
     max_retries: readNumberValue(settingMaxRetries, 3),
     retry_delay: readNumberValue(settingRetryDelay, 2),
@@ -1891,6 +1925,11 @@ async function saveSettings() {
     captcha_retry_limit: readNumberValue(settingCaptchaRetryLimit, 5),
     captcha_retry_unlimited: settingCaptchaRetryUnlimited.checked,
     captcha_save_samples: settingCaptchaSaveSamples.checked,
+    captcha_fused_solver: settingCaptchaFusedSolver.checked,
+    captcha_network_capture: settingCaptchaNetworkCapture.checked,
+    captcha_service: settingCaptchaService.checked,
+    captcha_sift_weight: readNumberValue(settingCaptchaSiftWeight, 0.5),
+    captcha_template_weight: readNumberValue(settingCaptchaTemplateWeight, 0.5),
     skip_push_title: settingSkipPushTitle.value.trim(),
     notify_config: {},
     notify_channels: notifyChannelsPayload,